@@ -8,45 +8,54 @@ Uses dataclasses for better IDE support, type checking, and validation.
 
 import os
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional
+
+
+# Directory roots are resolved once at import time; realpath stats the
+# filesystem, so recomputing them for every DirectoryConfig() is wasted work.
+_MODULE_DIR = os.path.dirname(__file__)
+_BASE_DIR = os.path.realpath(os.path.join(_MODULE_DIR, ".."))
+_BUILD_DIR = os.path.realpath("build")
+_RESOURCES_DIR = os.path.realpath("resources")
+_SCRIPTS_DIR = os.path.realpath("scripts")
+_CONFIG_DIR = os.path.realpath("config")
+
+
+# Constant multi-component path tails, pre-joined so computed properties do a
+# single concatenation instead of walking several os.path.join arguments.
+_KERNEL_DEB_REL = "linux/guest/linux-image-*.deb"
+_KERNEL_VMLINUZ_REL = "boot/vmlinuz-*"
+_OVMF_REL = "usr/local/share/qemu/DIRECT_BOOT_OVMF.fd"
 
 
-@dataclass
 class DirectoryConfig:
     """Directory paths used throughout the build system."""
-    
-    # Core directories
-    base: str = field(init=False)
-    build: str = field(init=False)
-    bin: str = field(init=False)
-    content: str = field(init=False)
-    guest: str = field(init=False)
-    kernel: str = field(init=False)
-    verity: str = field(init=False)
-    snp: str = field(init=False)
-    snp_package: str = field(init=False)
-    resources: str = field(init=False)
-    scripts: str = field(init=False)
-    config: str = field(init=False)
-    
-    def __post_init__(self):
+
+    __slots__ = (
+        "base", "build", "bin", "content", "guest", "kernel", "verity",
+        "snp", "snp_package", "resources", "scripts", "config",
+    )
+
+    def __init__(self):
         """Initialize computed directory paths."""
-        self.base = os.path.realpath(os.path.join(os.path.dirname(__file__), ".."))
-        self.build = os.path.realpath("build")
-        self.bin = os.path.join(self.build, "bin")
-        self.content = os.path.join(self.build, "content")
-        self.guest = os.path.join(self.build, "guest")
-        self.kernel = os.path.join(self.build, "kernel")
-        self.verity = os.path.join(self.build, "verity")
-        self.snp = os.path.join(self.build, "snp-release")
-        self.snp_package =  os.path.join(self.build, "SNP_PACKAGE")
-        self.resources = os.path.realpath("resources")
-        self.scripts = os.path.realpath("scripts")
-        self.config = os.path.realpath("config")
+        self.base = _BASE_DIR
+        self.build = _BUILD_DIR
+        self.bin = os.path.join(_BUILD_DIR, "bin")
+        self.content = os.path.join(_BUILD_DIR, "content")
+        self.guest = os.path.join(_BUILD_DIR, "guest")
+        self.kernel = os.path.join(_BUILD_DIR, "kernel")
+        self.verity = os.path.join(_BUILD_DIR, "verity")
+        self.snp = os.path.join(_BUILD_DIR, "snp-release")
+        self.snp_package = os.path.join(_BUILD_DIR, "SNP_PACKAGE")
+        self.resources = _RESOURCES_DIR
+        self.scripts = _SCRIPTS_DIR
+        self.config = _CONFIG_DIR
 
 
-@dataclass
+@dataclass(slots=True)
 class BuildConfig:
     """Build-related configuration settings."""
     
@@ -68,7 +77,7 @@ class BuildConfig:
     gpu_admin_tools_repo: str = "https://github.com/permaweb/gpu-admin-tools"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class VMConfig:
     """Virtual machine configuration settings."""
     
@@ -88,7 +97,7 @@ class VMConfig:
     cmdline: str = "console=ttyS0 earlyprintk=serial root=/dev/sda"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TCBConfig:
     """Trusted Computing Base (TCB) configuration."""
     
@@ -99,7 +108,7 @@ class TCBConfig:
     reserved: List[int] = field(default_factory=lambda: [0, 0, 0, 0])
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NetworkConfig:
     """Network and SSH configuration."""
     
@@ -110,7 +119,7 @@ class NetworkConfig:
     qemu_port: int = 4444
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class QEMUConfig:
     """QEMU-specific configuration."""
     
@@ -118,19 +127,27 @@ class QEMUConfig:
     snp_params: str = "-sev-snp"
 
 
+# Constant package set, hoisted so SNPConfig construction doesn't rebuild the
+# list through a default_factory closure on every instantiation.
+_SNP_DEPENDENCIES: tuple = (
+    "build-essential", "git", "python3", "python3-venv", "ninja-build",
+    "libglib2.0-dev", "uuid-dev", "iasl", "nasm", "python-is-python3",
+    "flex", "bison", "openssl", "libssl-dev", "libelf-dev", "bc",
+    "libncurses-dev", "gawk", "dkms", "libudev-dev", "libpci-dev",
+    "libiberty-dev", "autoconf", "llvm", "cpio", "zstd", "debhelper",
+    "rsync", "wget", "python3-tomli"
+)
+
+
 @dataclass
 class SNPConfig:
     """SNP package building configuration."""
-    
+
     release_url: str = "https://github.com/permaweb/hb-os/releases/download/v1.0.0/snp-release.tar.gz"
-    dependencies: List[str] = field(default_factory=lambda: [
-        "build-essential", "git", "python3", "python3-venv", "ninja-build",
-        "libglib2.0-dev", "uuid-dev", "iasl", "nasm", "python-is-python3",
-        "flex", "bison", "openssl", "libssl-dev", "libelf-dev", "bc",
-        "libncurses-dev", "gawk", "dkms", "libudev-dev", "libpci-dev",
-        "libiberty-dev", "autoconf", "llvm", "cpio", "zstd", "debhelper",
-        "rsync", "wget", "python3-tomli"
-    ])
+    # Optional sha256 hex digest of the release tarball; verified during the
+    # streaming download when set.
+    release_sha256: str = ""
+    dependencies: tuple = _SNP_DEPENDENCIES
 
 
 class HyperBeamConfig:
@@ -154,6 +171,41 @@ class HyperBeamConfig:
         # Allow runtime modification of branch settings
         self._runtime_hb_branch: Optional[str] = None
         self._runtime_ao_branch: Optional[str] = None
+
+        # (mtime, value) memo for file-backed settings such as verity_params
+        self._file_cache: Dict[str, Any] = {}
+
+        # Backward-compatibility string forms, materialized once so hot
+        # string-formatting paths read plain attributes instead of calling
+        # property wrappers that re-run str() every access.
+        self.debug = "1" if self.build.debug else "0"
+        self.enable_kvm = "1" if self.build.enable_kvm else "0"
+        self.enable_tpm = "1" if self.build.enable_tpm else "0"
+        self.enable_gpu = "1" if self.build.enable_gpu else "0"
+        self.network_vm_port = str(self.network.vm_port)
+        self.qemu_memory = str(self.vm.memory_mb)
+        self.qemu_hb_port = str(self.network.hb_port)
+        self.qemu_port = str(self.network.qemu_port)
+
+    def _cached_file_read(self, path: str, transform) -> Any:
+        """
+        Read and transform a file, memoizing the result keyed on the file's
+        mtime so repeated accesses skip disk I/O until the file changes.
+        """
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            mtime = None
+        cached = self._file_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(path, "r") as f:
+                value = transform(f.read())
+        except Exception:
+            value = transform(None)
+        self._file_cache[path] = (mtime, value)
+        return value
     
     # ===================== Dynamic Properties =====================
     
@@ -184,108 +236,88 @@ class HyperBeamConfig:
         """Base VM image filename."""
         return self.build.base_image
     
-    @property
+    @cached_property
     def vm_image_base_path(self) -> str:
         """Full path to base VM image."""
         return os.path.join(self.dirs.guest, self.build.base_image)
     
-    @property
+    @cached_property
     def vm_cloud_config(self) -> str:
         """Path to VM cloud config blob."""
         return os.path.join(self.dirs.guest, "config-blob.img")
     
-    @property
+    @cached_property
     def vm_template_user_data(self) -> str:
         """Path to VM template user data."""
         return os.path.join(self.dirs.resources, "template-user-data")
     
-    @property
+    @cached_property
     def kernel_deb(self) -> str:
         """Path pattern for kernel .deb package."""
-        return os.path.join(self.dirs.snp, "linux", "guest", "linux-image-*.deb")
+        return f"{self.dirs.snp}/{_KERNEL_DEB_REL}"
     
-    @property
+    @cached_property
     def kernel_vmlinuz(self) -> str:
         """Path pattern for kernel vmlinuz."""
-        return os.path.join(self.dirs.kernel, "boot", "vmlinuz-*")
+        return f"{self.dirs.kernel}/{_KERNEL_VMLINUZ_REL}"
     
-    @property
+    @cached_property
     def ovmf(self) -> str:
         """Path to OVMF firmware."""
-        return os.path.join(self.dirs.snp, "usr", "local", "share", "qemu", "DIRECT_BOOT_OVMF.fd")
+        return f"{self.dirs.snp}/{_OVMF_REL}"
     
-    @property
+    @cached_property
     def initrd(self) -> str:
         """Path to initramfs image."""
         return os.path.join(self.dirs.build, "initramfs.cpio.gz")
     
-    @property
+    @cached_property
     def initramfs_script(self) -> str:
         """Path to initramfs init script."""
         return os.path.join(self.dirs.scripts, "init.sh")
     
-    @property
+    @cached_property
     def initramfs_dockerfile(self) -> str:
         """Path to initramfs Dockerfile."""
         return os.path.join(self.dirs.resources, "initramfs.Dockerfile")
     
-    @property
+    @cached_property
     def content_dockerfile(self) -> str:
         """Path to content Dockerfile."""
         return os.path.join(self.dirs.resources, "content.Dockerfile")
     
-    @property
+    @cached_property
     def vm_config_file(self) -> str:
         """Path to VM configuration file."""
         return os.path.join(self.dirs.guest, "vm-config.toml")
     
-    @property
+    @cached_property
     def verity_image(self) -> str:
         """Path to verity image."""
         return os.path.join(self.dirs.verity, self.build.guest_image)
     
-    @property
+    @cached_property
     def verity_hash_tree(self) -> str:
         """Path to verity hash tree."""
         return os.path.join(self.dirs.verity, "hash_tree.bin")
     
-    @property
+    @cached_property
     def verity_root_hash(self) -> str:
         """Path to verity root hash file."""
         return os.path.join(self.dirs.verity, "roothash.txt")
     
-    @property
+    @cached_property
     def ssh_hosts_file(self) -> str:
         """Path to SSH known hosts file."""
         return os.path.join(self.dirs.build, "known_hosts")
     
-    @property
+    @cached_property
     def snp_amdsev_path(self) -> str:
         """Path to AMDSEV repository."""
         return os.path.join(self.dirs.build, "AMDSEV")
     
     # ===================== Computed Parameters =====================
     
-    @property
-    def debug(self) -> str:
-        """Debug flag as string (for backward compatibility)."""
-        return "1" if self.build.debug else "0"
-    
-    @property
-    def enable_kvm(self) -> str:
-        """KVM enable flag as string (for backward compatibility)."""
-        return "1" if self.build.enable_kvm else "0"
-    
-    @property
-    def enable_tpm(self) -> str:
-        """TPM enable flag as string (for backward compatibility)."""
-        return "1" if self.build.enable_tpm else "0"
-    
-    @property
-    def enable_gpu(self) -> str:
-        """GPU enable flag as string (for backward compatibility)."""
-        return "1" if self.build.enable_gpu else "0"
-    
     @property
     def vcpu_count(self) -> int:
         """Number of virtual CPUs."""
@@ -326,27 +358,22 @@ class HyperBeamConfig:
         """Image ID."""
         return self.vm.image_id
     
-    @property
-    def min_committed_tcb(self) -> Dict[str, Any]:
-        """Minimum committed TCB configuration."""
-        return {
+    @cached_property
+    def min_committed_tcb(self) -> Mapping[str, Any]:
+        """Minimum committed TCB configuration (shared read-only mapping)."""
+        return MappingProxyType({
             "bootloader": self.tcb.bootloader,
             "tee": self.tcb.tee,
             "snp": self.tcb.snp,
             "microcode": self.tcb.microcode,
-            "_reserved": self.tcb.reserved,
-        }
+            "_reserved": tuple(self.tcb.reserved),
+        })
     
     @property
     def network_vm_host(self) -> str:
         """VM network host."""
         return self.network.vm_host
     
-    @property
-    def network_vm_port(self) -> str:
-        """VM network port as string (for backward compatibility)."""
-        return str(self.network.vm_port)
-    
     @property
     def network_vm_user(self) -> str:
         """VM network user."""
@@ -362,21 +389,6 @@ class HyperBeamConfig:
         """QEMU SNP parameters."""
         return self.qemu.snp_params
     
-    @property
-    def qemu_memory(self) -> str:
-        """QEMU memory as string (for backward compatibility)."""
-        return str(self.vm.memory_mb)
-    
-    @property
-    def qemu_hb_port(self) -> str:
-        """QEMU HyperBEAM port as string (for backward compatibility)."""
-        return str(self.network.hb_port)
-    
-    @property
-    def qemu_port(self) -> str:
-        """QEMU port as string (for backward compatibility)."""
-        return str(self.network.qemu_port)
-    
     @property
     def qemu_ovmf(self) -> str:
         """QEMU OVMF path."""
@@ -387,20 +399,24 @@ class HyperBeamConfig:
         """QEMU build directory."""
         return self.dirs.build
     
-    @property
+    @cached_property
+    def qemu_log_file(self) -> str:
+        """Path to the QEMU stdout log file."""
+        return os.path.join(self.dirs.build, "stdout.log")
+
+    @cached_property
     def qemu_default_params(self) -> str:
         """Default QEMU parameters."""
-        log_file = os.path.join(self.dirs.build, 'stdout.log')
-        return (f"-default-network -log {log_file} "
+        return (f"-default-network -log {self.qemu_log_file} "
                 f"-mem {self.qemu_memory} -smp {self.vcpu_count} ")
     
-    @property
+    @cached_property
     def qemu_extra_params(self) -> str:
         """Extra QEMU parameters."""
         return f"-bios {self.qemu_ovmf} -policy {self.guest_policy}"
     
     @property
-    def snp_dependencies(self) -> List[str]:
+    def snp_dependencies(self) -> tuple:
         """SNP build dependencies."""
         return self.snp.dependencies
     
@@ -409,12 +425,12 @@ class HyperBeamConfig:
         """
         Computes the verity parameters by reading the content of the root hash file.
         If the file does not exist or an error occurs, a placeholder value is used.
+        The file content is cached on its mtime so repeated accesses avoid disk I/O.
         """
-        try:
-            with open(self.verity_root_hash, "r") as f:
-                roothash = f.read().strip()
-        except Exception:
-            roothash = "unknown"
+        roothash = self._cached_file_read(
+            self.verity_root_hash,
+            lambda text: text.strip() if text else "unknown",
+        )
         return f"boot=verity verity_disk=/dev/sdb verity_roothash={roothash}"
     
     # ===================== Backward Compatibility =====================
@@ -425,5 +441,18 @@ class HyperBeamConfig:
         return self.dirs
 
 
-# Create the global configuration instance
-config = HyperBeamConfig()
\ No newline at end of file
+# The global configuration instance is created lazily (PEP 562) so that
+# importing this module stays cheap for CLI paths that never read it.
+_config: Optional[HyperBeamConfig] = None
+
+__all__ = ["config"]
+
+
+def __getattr__(name: str) -> HyperBeamConfig:
+    """Build the global ``config`` instance on first attribute access."""
+    if name == "config":
+        global _config
+        if _config is None:
+            _config = HyperBeamConfig()
+        return _config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
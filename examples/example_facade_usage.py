@@ -6,12 +6,11 @@ This script shows how the facade pattern simplifies complex operations
 into easy-to-use, high-level workflows.
 """
 
-from src.core.service_factory import get_service_container
-from src.core.facade_interfaces import IHyperBeamFacade
-
-
 def main():
     """Demonstrate facade usage patterns."""
+    # Imported lazily so merely loading this module stays cheap
+    from src.core.service_factory import get_service_container
+    from src.core.facade_interfaces import IHyperBeamFacade
     
     print("🎭 HyperBEAM Facade System Demo")
     print("=" * 50)
@@ -6,13 +6,15 @@ Contains the exact same functions without modifications.
 
 import os
 import sys
-import argparse
-from typing import Optional, NoReturn
+from types import SimpleNamespace
+from typing import Dict, List, NoReturn, Optional, Tuple
 from config import config
-from src.core import init, setup_host, setup_gpu, build_snp_packages, build_base_image, build_guest_image, start_vm, start_release_vm, ssh_vm
-from src.services import package_release, download_release, clean
 from src.utils import HyperBeamError
 
+# The src.core / src.services subsystems are imported lazily inside the
+# command branches that need them, so help/error paths and lightweight
+# commands don't pay for loading the whole build and VM machinery.
+
 
 def show_help() -> None:
     """
@@ -38,6 +40,7 @@ COMMANDS:
     Options:
       --hb-branch BRANCH     HyperBEAM branch to use
       --ao-branch BRANCH     AO branch to use
+      --no-cache             Rebuild content without Docker's layer cache
   
   start               Start the VM using QEMU with the guest image configuration
     Options:
@@ -74,102 +77,109 @@ EXAMPLES:
     print(help_text)
 
 
-def create_argument_parser() -> argparse.ArgumentParser:
+# Command-line grammar: command -> list of (flag, dest, takes_value, required).
+# The tool's grammar is tiny and fixed, so a hand-rolled dispatch table avoids
+# argparse's per-invocation subparser construction on every CLI startup.
+COMMANDS: Dict[str, List[Tuple[str, str, bool, bool]]] = {
+    "help": [],
+    "init": [("--snp-release", "snp_release", True, False)],
+    "setup_host": [],
+    "setup_gpu": [],
+    "build_snp_release": [],
+    "build_base": [],
+    "build_guest": [
+        ("--hb-branch", "hb_branch", True, False),
+        ("--ao-branch", "ao_branch", True, False),
+        ("--no-cache", "no_cache", False, False),
+    ],
+    "start": [
+        ("--data-disk", "data_disk", True, False),
+        ("--enableSSL", "enableSSL", False, False),
+    ],
+    "start_release": [
+        ("--data-disk", "data_disk", True, False),
+        ("--enableSSL", "enableSSL", False, False),
+    ],
+    "package_release": [],
+    "download_release": [("--url", "url", True, True)],
+    "ssh": [],
+    "clean": [],
+}
+
+
+# Accepted URL schemes for download_release, as a tuple so a single C-level
+# str.startswith call covers both prefixes.
+_URL_PREFIXES = ("http://", "https://")
+
+
+def _parse_error(message: str) -> NoReturn:
+    """Print a usage error and exit with the conventional status code."""
+    print(f"Error: {message}", file=sys.stderr)
+    print("Run './run help' for usage information.", file=sys.stderr)
+    sys.exit(2)
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> SimpleNamespace:
     """
-    Create and configure the command-line argument parser with all subcommands.
-    
+    Parse command-line arguments against the COMMANDS dispatch table.
+
+    Args:
+        argv: Argument list to parse (defaults to sys.argv[1:])
+
     Returns:
-        argparse.ArgumentParser: Configured argument parser
+        SimpleNamespace: Parsed arguments with `target` plus command options
     """
-    # Create the main parser
-    parser = argparse.ArgumentParser(
-        description="HyperBEAM VM Automation Tool"
-    )
-    
-    # Create subparsers for each command
-    subparsers = parser.add_subparsers(dest="target", help="Target task to execute")
-    
-    # Help command
-    help_parser = subparsers.add_parser("help", help="Display detailed help information")
-    
-    # Init command
-    init_parser = subparsers.add_parser("init", help="Initialize the build environment")
-    init_parser.add_argument(
-        "--snp-release",
-        metavar="PATH",
-        help="Path to pre-built SNP release directory or tarball (optional)"
-    )
-    
-    # Setup host command
-    setup_host_parser = subparsers.add_parser("setup_host", help="Set up the host system")
+    if argv is None:
+        argv = sys.argv[1:]
 
-    # Setup GPU command
-    setup_gpu_parser = subparsers.add_parser("setup_gpu", help="Setup the GPU CC for the host system")
-    
-    # Build SNP release command
-    build_snp_release_parser = subparsers.add_parser("build_snp_release", help="Build SNP release package from source")
-    
-    # Build base command
-    build_base_parser = subparsers.add_parser("build_base", help="Build the base VM image")
-    
-    # Build guest command
-    build_guest_parser = subparsers.add_parser("build_guest", help="Build the guest image")
-    build_guest_parser.add_argument(
-        "--hb-branch",
-        help="HyperBEAM branch to use"
-    )
-    build_guest_parser.add_argument(
-        "--ao-branch",
-        help="AO branch to use"
-    )
-    
-    # Start command
-    start_parser = subparsers.add_parser("start", help="Start the VM")
-    start_parser.add_argument(
-        "--data-disk",
-        help="Path to data disk image"
-    )
-    start_parser.add_argument(
-        "--enableSSL",
-        action="store_true",
-        help="Enable SSL port forwarding (443)"
-    )
+    args = SimpleNamespace(target=None)
+    if not argv:
+        return args
 
-    
-    # Start release command
-    start_release_parser = subparsers.add_parser("start_release", help="Start the VM in release mode")
-    start_release_parser.add_argument(
-        "--data-disk",
-        help="Path to data disk image"
-    )
-    start_release_parser.add_argument(
-        "--enableSSL",
-        action="store_true",
-        help="Enable SSL port forwarding (443)"
-    )
-
-
-    # Package release command
-    package_release_parser = subparsers.add_parser("package_release", help="Package files for release")
-    
-    # Download release command
-    download_release_parser = subparsers.add_parser("download_release", help="Download a release")
-    download_release_parser.add_argument(
-        "--url",
-        required=True,
-        help="URL to a tar.gz release file (required)"
-    )
-    
-    # SSH command
-    ssh_parser = subparsers.add_parser("ssh", help="SSH into the virtual machine")
-    
-    # Clean command
-    clean_parser = subparsers.add_parser("clean", help="Clean up the build directory")
-    
-    return parser
+    target = argv[0]
+    if target in ("-h", "--help"):
+        args.target = "help"
+        return args
+    if target not in COMMANDS:
+        _parse_error(f"unknown command: {target}")
+    args.target = target
+
+    specs = COMMANDS[target]
+    flag_map = {flag: (dest, takes_value) for flag, dest, takes_value, _ in specs}
+    for _, dest, takes_value, _ in specs:
+        setattr(args, dest, None if takes_value else False)
+
+    i = 1
+    while i < len(argv):
+        token = argv[i]
+        if token in ("-h", "--help"):
+            show_help()
+            sys.exit(0)
+        flag, eq, inline_value = token.partition("=")
+        if flag not in flag_map:
+            _parse_error(f"unknown option for {target}: {token}")
+        dest, takes_value = flag_map[flag]
+        if takes_value:
+            if eq:
+                value = inline_value
+            else:
+                i += 1
+                if i >= len(argv):
+                    _parse_error(f"option {flag} requires a value")
+                value = argv[i]
+            setattr(args, dest, value)
+        else:
+            setattr(args, dest, True)
+        i += 1
 
+    for flag, dest, takes_value, required in specs:
+        if required and not getattr(args, dest):
+            _parse_error(f"option {flag} is required for {target}")
 
-def process_arguments(args: argparse.Namespace) -> bool:
+    return args
+
+
+def process_arguments(args: SimpleNamespace) -> bool:
     """
     Process and validate parsed arguments, handling special cases and configuration.
     
@@ -191,26 +201,29 @@ def process_arguments(args: argparse.Namespace) -> bool:
     
     # Set configuration values for build_guest with validation
     if args.target == "build_guest":
-        if hasattr(args, 'hb_branch') and args.hb_branch:
-            if not isinstance(args.hb_branch, str) or not args.hb_branch.strip():
+        hb_branch = getattr(args, 'hb_branch', None)
+        if hb_branch:
+            if not isinstance(hb_branch, str) or not hb_branch.strip():
                 raise ValueError("HyperBEAM branch must be a non-empty string")
-            config.build.hb_branch = args.hb_branch.strip()
-        if hasattr(args, 'ao_branch') and args.ao_branch:
-            if not isinstance(args.ao_branch, str) or not args.ao_branch.strip():
+            config.build.hb_branch = hb_branch.strip()
+        ao_branch = getattr(args, 'ao_branch', None)
+        if ao_branch:
+            if not isinstance(ao_branch, str) or not ao_branch.strip():
                 raise ValueError("AO branch must be a non-empty string")
-            config.build.ao_branch = args.ao_branch.strip()
-    
+            config.build.ao_branch = ao_branch.strip()
+
     # Handle download_release as a special case (immediate execution)
     if args.target == "download_release":
         # Validate URL argument
-        if not hasattr(args, 'url') or not args.url:
+        if not getattr(args, 'url', None):
             raise ValueError("URL is required for download_release command")
         if not isinstance(args.url, str) or not args.url.strip():
             raise ValueError("URL must be a non-empty string")
-        if not (args.url.startswith('http://') or args.url.startswith('https://')):
+        if not args.url.startswith(_URL_PREFIXES):
             raise ValueError("URL must start with http:// or https://")
         
         try:
+            from src.services import download_release
             download_release(args.url.strip())
             sys.exit(0)
         except HyperBeamError as e:
@@ -223,7 +236,7 @@ def process_arguments(args: argparse.Namespace) -> bool:
     return True
 
 
-def dispatch_command(args: argparse.Namespace) -> None:
+def dispatch_command(args: SimpleNamespace) -> None:
     """
     Dispatch the appropriate command based on the target argument.
     
@@ -240,28 +253,40 @@ def dispatch_command(args: argparse.Namespace) -> None:
     # hyperbeam = container.resolve(IHyperBeamFacade)
     # hyperbeam.quick_setup() or hyperbeam.development_workflow()
     
-    # For now, using legacy functions that delegate to the DI system internally:
+    # For now, using legacy functions that delegate to the DI system internally.
+    # Each branch imports only what it needs to keep CLI startup light:
     if args.target == "init":
+        from src.core import init
         init(args.snp_release)
     elif args.target == "setup_host":
+        from src.core import setup_host
         setup_host()
     elif args.target == "setup_gpu":
+        from src.core import setup_gpu
         setup_gpu()
     elif args.target == "build_snp_release":
+        from src.core import build_snp_packages
         build_snp_packages(config)
     elif args.target == "build_base":
+        from src.core import build_base_image
         build_base_image()
     elif args.target == "build_guest":
-        build_guest_image()
+        from src.core import build_guest_image
+        build_guest_image(no_cache=getattr(args, 'no_cache', False))
     elif args.target == "start":
+        from src.core import start_vm
         start_vm(args.data_disk, getattr(args, 'enableSSL', False))
     elif args.target == "start_release":
+        from src.core import start_release_vm
         start_release_vm(args.data_disk, getattr(args, 'enableSSL', False))
     elif args.target == "package_release":
+        from src.services import package_release
         package_release()
     elif args.target == "ssh":
+        from src.core import ssh_vm
         ssh_vm()
     elif args.target == "clean":
+        from src.services import clean
         clean()
     else:
         print(f"Unknown target: {args.target}")
@@ -275,10 +300,14 @@ def main() -> NoReturn:
     
     Note: This function never returns normally - it always exits via sys.exit()
     """
-    # Create and use argument parser
-    parser = create_argument_parser()
-    args = parser.parse_args()
-    
+    # Fast path: the common discovery invocations need no parsing at all
+    if len(sys.argv) < 2 or sys.argv[1] in ("help", "-h", "--help"):
+        show_help()
+        sys.exit(0)
+
+    # Parse arguments via the dispatch table
+    args = parse_arguments()
+
     # Process arguments (handles help, config, and special cases)
     process_arguments(args)
     
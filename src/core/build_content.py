@@ -1,20 +1,21 @@
 import os
-import time
 from typing import Optional
 from src.utils import remove_directory, ensure_directory
-from src.services import docker_service, DockerfileTemplateProcessor
+from src.services import docker_service
 
-def build_guest_content(out_dir: str, dockerfile: str, hb_branch: str, ao_branch: str, debug: bool = False) -> None:
+def build_guest_content(out_dir: str, dockerfile: str, hb_branch: str, ao_branch: str,
+                        debug: bool = False, no_cache: bool = False) -> None:
     """
     Build guest content using Docker with proper resource management.
-    
+
     Args:
         out_dir (str): Output directory for the built content
         dockerfile (str): Path to the Dockerfile template
         hb_branch (str): HyperBEAM branch to use
         ao_branch (str): AO branch to use
         debug (bool): Skip HyperBEAM building steps if True
-        
+        no_cache (bool): Force a full rebuild without Docker's layer cache
+
     Raises:
         DockerError: If any Docker operation fails
         FileSystemError: If required files are missing
@@ -30,29 +31,27 @@ def build_guest_content(out_dir: str, dockerfile: str, hb_branch: str, ao_branch
     context_dir = os.path.dirname(dockerfile)
     dockerfile_name = os.path.basename(dockerfile)
 
-    # Process Dockerfile template with automatic restoration
-    template_vars = {
+    # Branches flow in purely as build args: the Dockerfile declares
+    # ARG HB_BRANCH / ARG AO_BRANCH below its toolchain layers, so changing a
+    # branch re-runs only the clone/build layer while apt and toolchain
+    # layers stay cached. No textual template rewriting is needed.
+    build_args = {
         "HB_BRANCH": hb_branch,
-        "AO_BRANCH": ao_branch
+        "AO_BRANCH": ao_branch,
+        "SKIP_HYPERBEAM": "true" if debug else "false"
     }
-    
-    with DockerfileTemplateProcessor.managed_template(dockerfile, template_vars):
-        # Build Docker image with cache busting and debug flag
-        build_args = {
-            "CACHEBUST": str(int(time.time())),
-            "SKIP_HYPERBEAM": "true" if debug else "false"
-        }
-        
-        if debug:
-            print("🐛 Debug mode: Building Docker image with SKIP_HYPERBEAM=true")
-        else:
-            print("📦 Production mode: Building Docker image with SKIP_HYPERBEAM=false")
-        
-        docker_service.build_image(context_dir, dockerfile_name, docker_img, build_args)
-
-        # Run container and copy files with automatic cleanup
-        with docker_service.managed_container(docker_img, container_name) as container:
-            # Copy files from the container
-            docker_service.copy_from_container(container, "/release/.", out_dir)
+
+    if debug:
+        print("🐛 Debug mode: Building Docker image with SKIP_HYPERBEAM=true")
+    else:
+        print("📦 Production mode: Building Docker image with SKIP_HYPERBEAM=false")
+
+    docker_service.build_image(context_dir, dockerfile_name, docker_img, build_args,
+                               no_cache=no_cache)
+
+    # Run container and copy files with automatic cleanup
+    with docker_service.managed_container(docker_img, container_name) as container:
+        # Copy files from the container
+        docker_service.copy_from_container(container, "/release/.", out_dir)
 
     print(f"✅ Done! The /release folder has been copied to {out_dir}")
@@ -5,6 +5,9 @@ Contains the exact same functions without modifications.
 """
 
 import os
+import shutil
+import subprocess
+import tarfile
 from typing import Optional
 from config import config
 from .create_new_vm import create_vm_image
@@ -27,33 +30,78 @@ def create_vm() -> None:
     )
 
 
+def _extract_deb(deb_path: str, dest_dir: str) -> None:
+    """
+    Extract a Debian package's data archive in-process.
+
+    A .deb is an ar(1) container whose payload lives in a data.tar.* member;
+    walking the ar headers and handing the member to tarfile avoids the
+    fork+exec chain of dpkg -x (which itself spawns ar and tar).
+
+    Raises:
+        tarfile.ReadError: If the payload compression is unsupported
+                           (e.g. zstd); callers may fall back to dpkg.
+    """
+    with open(deb_path, "rb") as ar_file:
+        if ar_file.read(8) != b"!<arch>\n":
+            raise RuntimeError(f"Not an ar archive: {deb_path}")
+        while True:
+            header = ar_file.read(60)
+            if len(header) < 60:
+                raise RuntimeError(f"No data.tar member found in {deb_path}")
+            name = header[0:16].decode("ascii").strip().rstrip("/")
+            size = int(header[48:58].decode("ascii").strip())
+            if name.startswith("data.tar"):
+                with tarfile.open(fileobj=ar_file, mode="r|*") as tar:
+                    tar.extractall(dest_dir)
+                return
+            # ar members are 2-byte aligned
+            ar_file.seek(size + (size & 1), os.SEEK_CUR)
+
+
+def _find_kernel_debs(kernel_deb_pattern: str) -> list:
+    """
+    Match kernel .deb files in a single os.scandir pass, skipping -dbg
+    packages; cheaper than glob.glob + a second filtering pass.
+    """
+    import fnmatch
+
+    deb_dir, deb_pattern = os.path.split(kernel_deb_pattern)
+    try:
+        with os.scandir(deb_dir) as entries:
+            return [e.path for e in entries
+                    if '-dbg' not in e.name
+                    and fnmatch.fnmatchcase(e.name, deb_pattern)]
+    except OSError:
+        return []
+
+
 def unpack_kernel() -> None:
     """
     Unpack the kernel package from a .deb file.
     """
-    import glob
-    
     kernel_dir = config.dir.kernel
     kernel_deb_pattern = config.kernel_deb
-    
-    # Find all matching .deb files
-    deb_files = glob.glob(kernel_deb_pattern)
-    
-    # Filter out debug packages (contain -dbg)
-    main_deb_files = [f for f in deb_files if '-dbg' not in f]
-    
+
+    main_deb_files = _find_kernel_debs(kernel_deb_pattern)
+
     if not main_deb_files:
         raise RuntimeError(f"No kernel .deb files found matching: {kernel_deb_pattern}")
-    
+
     if len(main_deb_files) > 1:
         print(f"Warning: Multiple kernel packages found: {main_deb_files}")
         print(f"Using the first one: {main_deb_files[0]}")
-    
+
     kernel_deb = main_deb_files[0]
     print(f"Unpacking kernel from: {kernel_deb}")
-    
-    run_command(f"rm -rf {kernel_dir}")
-    run_command(f"dpkg -x {kernel_deb} {kernel_dir}")
+
+    shutil.rmtree(kernel_dir, ignore_errors=True)
+    try:
+        _extract_deb(kernel_deb, kernel_dir)
+    except tarfile.ReadError:
+        # Payload uses a compression tarfile can't stream (e.g. zstd);
+        # let dpkg handle it.
+        subprocess.run(["dpkg", "-x", kernel_deb, kernel_dir], check=True)
 
 
 def initramfs_build() -> None:
@@ -130,31 +178,39 @@ def build_base_image() -> None:
     run_setup()
 
 
-def build_guest_image() -> None:
+def build_guest_image(no_cache: bool = False) -> None:
     """
     Build the guest image by:
       1. Building guest content.
       2. Setting up verity.
       3. Creating VM configuration.
       4. Generating hash measurements.
+
+    Args:
+        no_cache: Rebuild the guest content without Docker's layer cache
     """
     print("===> Building guest image")
-    build_content()
+    build_content(no_cache=no_cache)
     setup_verity()
     setup_vm_config()
     get_hashes()
 
 
-def build_content() -> None:
+def build_content(no_cache: bool = False) -> None:
     """
     Build the guest content using the provided Dockerfile.
+
+    Args:
+        no_cache: Rebuild without Docker's layer cache, forcing fresh
+            HyperBEAM/AO clones even when the branch names are unchanged
     """
     build_guest_content(
-        out_dir=config.dir.content, 
-        dockerfile=config.content_dockerfile, 
+        out_dir=config.dir.content,
+        dockerfile=config.content_dockerfile,
         hb_branch=config.hb_branch,
         ao_branch=config.ao_branch,
-        debug=config.build.debug
+        debug=config.build.debug,
+        no_cache=no_cache
     )
 
 
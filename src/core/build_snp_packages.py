@@ -2,24 +2,41 @@
 
 import os
 import sys
+import time
 from typing import Optional
 from src.services.snp_component_service import get_snp_component_service
 from src.utils import BuildError
 
+# Skip 'apt-get update' when the package lists were refreshed this recently
+_APT_LISTS_DIR = "/var/lib/apt/lists"
+_APT_UPDATE_MAX_AGE = 3600  # seconds
+
+
+def _apt_lists_fresh() -> bool:
+    """Return True when the apt metadata was updated within the last hour."""
+    try:
+        return (time.time() - os.stat(_APT_LISTS_DIR).st_mtime) < _APT_UPDATE_MAX_AGE
+    except OSError:
+        return False
+
 
 def install_snp_dependencies(dependencies: list[str]) -> None:
     """Install build dependencies for SNP packages."""
     from src.utils import run_command
-    
+
     print("📦 Installing SNP build dependencies...")
-    
-    # Update apt package list
-    run_command("sudo apt update")
-    
-    # Install dependencies
+
+    # One fused apt-get invocation: the metadata refresh (skipped when still
+    # fresh) and the install share a single dpkg lock acquisition, and the
+    # noninteractive frontend drops the TTY progress machinery.
     deps_str = " ".join(dependencies)
-    run_command(f"sudo apt install -y --no-install-recommends {deps_str}")
-    
+    install_cmd = ("sudo DEBIAN_FRONTEND=noninteractive apt-get install -y "
+                   f"--no-install-recommends {deps_str}")
+    if not _apt_lists_fresh():
+        install_cmd = ("sudo DEBIAN_FRONTEND=noninteractive apt-get update && "
+                       + install_cmd)
+    run_command(install_cmd)
+
     print("✅ Dependencies installed successfully")
 
 
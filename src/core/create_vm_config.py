@@ -5,6 +5,10 @@ import shutil
 from typing import Optional, Dict, Any
 from src.utils import run_command
 
+# Matches the quoted roothash command embedded in the kernel cmdline;
+# compiled once at import rather than per call.
+_VERITY_RE = re.compile(r"verity_roothash='([^']+)'")
+
 def create_vm_config_file(out_path: str, ovmf_path: str, kernel_path: str, initrd_path: str, 
                          kernel_cmdline: str, vm_config: Dict[str, Any]) -> None:
     """
@@ -51,49 +55,63 @@ def create_vm_config_file(out_path: str, ovmf_path: str, kernel_path: str, initr
                 _reserved: [0, 0, 0, 0]
     """
 
-    if "*" in kernel_path:
-        matches = glob.glob(kernel_path)
-        if matches:
-            kernel_path = matches[0]
-        else:
-            print(f"Warning: No files found matching {kernel_path}")
+    matches = glob.glob(kernel_path)
+    if matches:
+        kernel_path = matches[0]
+    elif "*" in kernel_path:
+        print(f"Warning: No files found matching {kernel_path}")
 
     # If the kernel_cmdline contains a cat command referring to ${build_verity}, evaluate it.
     if "cat" in kernel_cmdline:
-        match = re.search(r"verity_roothash='([^']+)'", kernel_cmdline)
+        match = _VERITY_RE.search(kernel_cmdline)
         if match:
-            cmd_str = match.group(1)
-            try:
-                result = run_command(cmd_str, capture_output=True)
-                output = result.stdout.strip() if result.stdout else ""
-            except Exception as e:
-                output = ""
-                print(f"Warning: command '{cmd_str}' failed with error: {e}")
-            kernel_cmdline = re.sub(r"verity_roothash='[^']+'",
-                                    f'verity_roothash={output}',
-                                    kernel_cmdline)
+            cmd_str = match.group(1).strip()
+            # The embedded command is almost always 'cat <roothash file>';
+            # read the file directly instead of forking a shell for it.
+            if cmd_str.startswith("cat ") and "|" not in cmd_str and ";" not in cmd_str:
+                file_path = cmd_str.split(None, 1)[1].strip()
+                try:
+                    with open(file_path, "r") as hash_file:
+                        output = hash_file.read().strip()
+                except OSError as e:
+                    output = ""
+                    print(f"Warning: could not read '{file_path}': {e}")
+            else:
+                try:
+                    result = run_command(cmd_str, capture_output=True)
+                    output = result.stdout.strip() if result.stdout else ""
+                except Exception as e:
+                    output = ""
+                    print(f"Warning: command '{cmd_str}' failed with error: {e}")
+            kernel_cmdline = _VERITY_RE.sub(f'verity_roothash={output}',
+                                            kernel_cmdline)
+
 
+    # Assemble the whole config in memory and write it in one call rather
+    # than re-entering the text encoder for every line.
+    tcb = vm_config.get("min_committed_tcb", {})
+    reserved_list = list(tcb.get('_reserved', (0, 0, 0, 0)))
+    content = "\n".join([
+        f'host_cpu_family = "{vm_config.get("host_cpu_family", "Milan")}"',
+        f'vcpu_count = {vm_config.get("vcpu_count", 1)}',
+        f'ovmf_file = "{ovmf_path}"',
+        f'guest_features = {vm_config.get("guest_features", "0x1")}',
+        f'kernel_file = "{kernel_path}"',
+        f'initrd_file = "{initrd_path}"',
+        f'kernel_cmdline = "{kernel_cmdline}"',
+        f'platform_info = {vm_config.get("platform_info", "0x3")}',
+        f'guest_policy = {vm_config.get("guest_policy", "0x30000")}',
+        f'family_id = "{vm_config.get("family_id", "00000000000000000000000000000000")}"',
+        f'image_id = "{vm_config.get("image_id", "00000000000000000000000000000000")}"',
+        "[min_commited_tcb]",
+        f"bootloader = {tcb.get('bootloader', 4)}",
+        f"tee = {tcb.get('tee', 0)}",
+        f"snp = {tcb.get('snp', 22)}",
+        f"microcode = {tcb.get('microcode', 213)}",
+        f"_reserved = {reserved_list}",
+    ]) + "\n"
 
     with open(out_path, "w") as f:
-        f.write(f'host_cpu_family = "{vm_config.get("host_cpu_family", "Milan")}"\n')
-        f.write(f'vcpu_count = {vm_config.get("vcpu_count", 1)}\n')
-        f.write(f'ovmf_file = "{ovmf_path}"\n')
-        f.write(f'guest_features = {vm_config.get("guest_features", "0x1")}\n')
-        f.write(f'kernel_file = "{kernel_path}"\n')
-        f.write(f'initrd_file = "{initrd_path}"\n')
-        f.write(f'kernel_cmdline = "{kernel_cmdline}"\n')
-        f.write(f'platform_info = {vm_config.get("platform_info", "0x3")}\n')
-        f.write(f'guest_policy = {vm_config.get("guest_policy", "0x30000")}\n')
-        f.write(f'family_id = "{vm_config.get("family_id", "00000000000000000000000000000000")}"\n')
-        f.write(f'image_id = "{vm_config.get("image_id", "00000000000000000000000000000000")}"\n')
-        f.write("[min_commited_tcb]\n")
-        
-        tcb = vm_config.get("min_committed_tcb", {})
-        f.write(f"bootloader = {tcb.get('bootloader', 4)}\n")
-        f.write(f"tee = {tcb.get('tee', 0)}\n")
-        f.write(f"snp = {tcb.get('snp', 22)}\n")
-        f.write(f"microcode = {tcb.get('microcode', 213)}\n")
-        reserved_list = tcb.get('_reserved', [0, 0, 0, 0])
-        f.write(f"_reserved = {reserved_list}\n")
-    
+        f.write(content)
+
     print(f"Written config to {out_path}")
\ No newline at end of file
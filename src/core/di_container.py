@@ -18,6 +18,57 @@ import inspect
 T = TypeVar('T')
 ServiceFactory = Callable[..., T]
 
+# Constructor dependencies per class, parsed once on first sight; repeated
+# resolutions then skip the inspect.signature walk entirely.
+_CTOR_DEPS_CACHE: Dict[Type, tuple] = {}
+
+# Sentinel distinguishing "not registered"/"not built" from a legitimately-None
+# value in single dict.get() fetches and entry slots.
+_MISSING = object()
+
+# Hoisted inspect.Parameter.empty; identity checks against it are a pointer
+# compare, where != goes through __eq__.
+_EMPTY = inspect.Parameter.empty
+
+
+def _extract_ctor_deps(cls: Type) -> tuple:
+    """
+    Return ((param_name, annotated_type), ...) for the injectable constructor
+    parameters of cls, caching the result per class.
+    """
+    deps = _CTOR_DEPS_CACHE.get(cls)
+    if deps is None:
+        sig = inspect.signature(cls.__init__)
+        collected = []
+        for name, param in sig.parameters.items():
+            if name == 'self':
+                continue
+            # Skip parameters with default values for now
+            if param.default is not _EMPTY:
+                continue
+            if param.annotation is not _EMPTY:
+                collected.append((name, param.annotation))
+        deps = tuple(collected)
+        _CTOR_DEPS_CACHE[cls] = deps
+    return deps
+
+
+class _Entry:
+    """
+    One service registration: a compact record instead of a dict of lambdas.
+
+    Slot layout keeps the resolution hot path to plain C-level attribute
+    reads and leaves the door open for a compiled registry later.
+    """
+
+    __slots__ = ("factory", "instance", "is_singleton", "deps")
+
+    def __init__(self):
+        self.factory: Optional[Callable] = None
+        self.instance: Any = _MISSING
+        self.is_singleton = False
+        self.deps: tuple = ()
+
 
 class ServiceNotFoundError(Exception):
     """Raised when a requested service is not registered in the container."""
@@ -37,133 +88,234 @@ class CircularDependencyError(Exception):
 class DIContainer:
     """
     Dependency Injection Container that manages service registration and resolution.
-    
+
     Features:
     - Service registration via factory functions or classes
-    - Singleton and transient lifecycle management  
+    - Singleton and transient lifecycle management
     - Automatic dependency resolution via constructor injection
     - Interface-based service registration
     - Circular dependency detection
     """
-    
+
     def __init__(self):
-        self._services: Dict[Type, ServiceFactory] = {}
-        self._singletons: Dict[Type, Any] = {}
+        self._entries: list = []  # _Entry records, indexed by small ints
+        self._type_index: Dict[Type, int] = {}  # service type -> entry index
         self._resolving: set = set()  # For circular dependency detection
-    
+        self._registrations: Dict[Type, Type] = {}  # service type -> implementation class
+        self._sealed = False
+
+    def _entry(self, service_type: Type) -> "_Entry":
+        """Fetch or create the registration record for service_type."""
+        index = self._type_index.get(service_type)
+        if index is None:
+            self._type_index[service_type] = len(self._entries)
+            entry = _Entry()
+            self._entries.append(entry)
+            return entry
+        return self._entries[index]
+
     def register_singleton(self, service_type: Type[T], instance: T) -> None:
         """
         Register a singleton instance for the given service type.
-        
+
         Args:
             service_type: The type/interface that this service implements
             instance: The singleton instance to register
         """
-        self._services[service_type] = lambda: instance
-        self._singletons[service_type] = instance
-    
+        entry = self._entry(service_type)
+        entry.is_singleton = True
+        entry.instance = instance
+        entry.factory = lambda: instance
+
     def register_factory(self, service_type: Type[T], factory: ServiceFactory[T]) -> None:
         """
         Register a factory function for creating instances of the service type.
-        
+
         Args:
             service_type: The type/interface that this service implements
             factory: Factory function that creates instances of this service
         """
-        self._services[service_type] = factory
-    
-    def register_class(self, service_type: Type[T], implementation_class: Type[T], 
+        entry = self._entry(service_type)
+        entry.is_singleton = False
+        entry.instance = _MISSING
+        entry.factory = factory
+
+    def register_class(self, service_type: Type[T], implementation_class: Type[T],
                       singleton: bool = True) -> None:
         """
         Register a class as the implementation for a service type.
-        
+
         Args:
             service_type: The type/interface that this service implements
             implementation_class: The concrete class that implements the service
             singleton: Whether to create a singleton instance or new instances each time
         """
-        if singleton:
-            def factory():
-                if service_type not in self._singletons:
-                    self._singletons[service_type] = self._create_instance(implementation_class)
-                return self._singletons[service_type]
-            self._services[service_type] = factory
-        else:
-            self._services[service_type] = lambda: self._create_instance(implementation_class)
-    
+        self._registrations[service_type] = implementation_class
+        # Walk the constructor once at registration; the factory below only
+        # iterates the precomputed tuple.
+        deps = _extract_ctor_deps(implementation_class)
+        entry = self._entry(service_type)
+        entry.is_singleton = singleton
+        entry.instance = _MISSING
+        entry.deps = deps
+        entry.factory = lambda: implementation_class(
+            **{name: self.resolve(dep_type) for name, dep_type in deps})
+
     def resolve(self, service_type: Type[T]) -> T:
         """
         Resolve an instance of the requested service type.
-        
+
         Args:
             service_type: The type/interface to resolve
-            
+
         Returns:
             An instance of the requested service
-            
+
         Raises:
             ServiceNotFoundError: If the service is not registered
             CircularDependencyError: If a circular dependency is detected
         """
-        if service_type not in self._services:
+        index = self._type_index.get(service_type)
+        if index is None:
             raise ServiceNotFoundError(service_type)
-        
+        entry = self._entries[index]
+
+        # Return singleton if already created
+        if entry.instance is not _MISSING:
+            return entry.instance
+
         # Check for circular dependencies
         if service_type in self._resolving:
             chain = list(self._resolving) + [service_type]
             raise CircularDependencyError(chain)
-        
-        # Return singleton if already created
-        if service_type in self._singletons:
-            return self._singletons[service_type]
-        
+
         # Add to resolving set for circular dependency detection
         self._resolving.add(service_type)
-        
+
         try:
-            factory = self._services[service_type]
-            instance = factory()
+            instance = entry.factory()
+            if entry.is_singleton:
+                entry.instance = instance
             return instance
         finally:
             # Remove from resolving set
             self._resolving.discard(service_type)
-    
+
     def _create_instance(self, cls: Type[T]) -> T:
         """
         Create an instance of the given class with automatic dependency injection.
-        
+
         Args:
             cls: The class to instantiate
-            
+
         Returns:
             An instance of the class with dependencies injected
         """
-        # Get constructor signature
-        sig = inspect.signature(cls.__init__)
-        args = {}
-        
-        # Resolve dependencies for each constructor parameter (except 'self')
-        for name, param in sig.parameters.items():
-            if name == 'self':
-                continue
-                
-            # Skip parameters with default values for now
-            if param.default != inspect.Parameter.empty:
-                continue
-                
-            # Get the parameter type annotation
-            param_type = param.annotation
-            if param_type != inspect.Parameter.empty:
-                args[name] = self.resolve(param_type)
-        
-        return cls(**args)
-    
+        return cls(**{name: self.resolve(dep_type)
+                      for name, dep_type in _extract_ctor_deps(cls)})
+
+    def seal(self) -> None:
+        """
+        Validate the dependency graph and switch to bookkeeping-free resolution.
+
+        Cycle detection normally runs on every resolve() via the _resolving
+        set; once the service graph is complete it can be checked once here,
+        after which resolve() is rebound to a fast path with no per-call
+        bookkeeping.
+
+        Raises:
+            CircularDependencyError: If the registered graph contains a cycle
+        """
+        visiting: list = []
+        done: set = set()
+
+        def visit(service_type: Type) -> None:
+            if service_type in done:
+                return
+            if service_type in visiting:
+                raise CircularDependencyError(
+                    visiting[visiting.index(service_type):] + [service_type])
+            impl = self._registrations.get(service_type)
+            if impl is not None:
+                visiting.append(service_type)
+                for _, dep_type in _extract_ctor_deps(impl):
+                    visit(dep_type)
+                visiting.pop()
+            done.add(service_type)
+
+        for service_type in list(self._type_index):
+            visit(service_type)
+
+        self._sealed = True
+        self.resolve = self._resolve_fast
+
+    def instantiate_singletons(self) -> None:
+        """
+        Eagerly construct every singleton registration.
+
+        Shifts all signature-inspection and wiring cost to startup; later
+        resolve() calls return the cached entry instance with a single
+        index lookup.
+        """
+        for service_type, index in list(self._type_index.items()):
+            if self._entries[index].is_singleton:
+                self.resolve(service_type)
+
+    def freeze(self) -> None:
+        """
+        Pack the resolved singletons into a __slots__ registry and rebind
+        resolve() to a descriptor fetch.
+
+        Slot access is a C-level offset read, cheaper than a dict probe plus
+        a call through a lambda; anything not packed (transients, types
+        registered later) falls back to the sealed fast path.
+        """
+        singletons = [(t, self._entries[i].instance)
+                      for t, i in self._type_index.items()
+                      if self._entries[i].is_singleton
+                      and self._entries[i].instance is not _MISSING]
+        registry_cls = type(
+            "_FrozenRegistry", (),
+            {"__slots__": tuple(f"_s{i}" for i in range(len(singletons)))})
+        registry = registry_cls()
+        descriptors = {}
+        for i, (service_type, instance) in enumerate(singletons):
+            setattr(registry, f"_s{i}", instance)
+            descriptors[service_type] = registry_cls.__dict__[f"_s{i}"]
+
+        fallback = self._resolve_fast
+
+        def frozen_resolve(service_type: Type[T]) -> T:
+            descriptor = descriptors.get(service_type)
+            if descriptor is not None:
+                return descriptor.__get__(registry, registry_cls)
+            return fallback(service_type)
+
+        self.resolve = frozen_resolve
+
+    def _resolve_fast(self, service_type: Type[T]) -> T:
+        """Resolution fast path for sealed containers: one lookup per entry."""
+        index = self._type_index.get(service_type)
+        if index is None:
+            raise ServiceNotFoundError(service_type)
+        entry = self._entries[index]
+        instance = entry.instance
+        if instance is not _MISSING:
+            return instance
+        instance = entry.factory()
+        if entry.is_singleton:
+            entry.instance = instance
+        return instance
+
     def is_registered(self, service_type: Type) -> bool:
         """Check if a service type is registered in the container."""
-        return service_type in self._services
-    
+        return service_type in self._type_index
+
     def clear(self) -> None:
         """Clear all registered services and singletons."""
-        self._services.clear()
-        self._singletons.clear()
-        self._resolving.clear()
\ No newline at end of file
+        self._entries.clear()
+        self._type_index.clear()
+        self._resolving.clear()
+        self._registrations.clear()
+        self._sealed = False
+        self.__dict__.pop('resolve', None)  # restore the unsealed resolve
@@ -6,11 +6,10 @@ This module defines high-level facade interfaces that simplify complex multi-ste
 workflows by providing simple, intuitive APIs for common use cases.
 """
 
-from typing import Protocol, Optional, Dict, Any, runtime_checkable
+from typing import Protocol, Optional, Dict, Any
 from pathlib import Path
 
 
-@runtime_checkable
 class ISetupFacade(Protocol):
     """
     Facade for environment setup and initialization operations.
@@ -52,7 +51,6 @@ class ISetupFacade(Protocol):
         ...
 
 
-@runtime_checkable
 class IBuildFacade(Protocol):
     """
     Facade for build operations and orchestration.
@@ -128,7 +126,6 @@ class IBuildFacade(Protocol):
         ...
 
 
-@runtime_checkable
 class IVMFacade(Protocol):
     """
     Facade for VM lifecycle management operations.
@@ -179,7 +176,6 @@ class IVMFacade(Protocol):
         ...
 
 
-@runtime_checkable
 class IReleaseFacade(Protocol):
     """
     Facade for release management operations.
@@ -234,7 +230,6 @@ class IReleaseFacade(Protocol):
         ...
 
 
-@runtime_checkable
 class IHyperBeamFacade(Protocol):
     """
     Main facade that orchestrates all HyperBEAM operations.
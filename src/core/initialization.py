@@ -4,13 +4,16 @@ Core initialization functionality moved from the run script.
 Contains the exact same functions without modifications.
 """
 
+import hashlib
 import os
 import shutil
+import tarfile
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from config import config
 from src.services import install_dependencies
-from src.utils import run_command, ensure_directory
+from src.utils import run_command
 
 
 def init(snp_release_path: Optional[str] = None) -> None:
@@ -25,18 +28,82 @@ def init(snp_release_path: Optional[str] = None) -> None:
         snp_release_path: Optional path to pre-built SNP release directory or tarball
     """
 
-    # Go thru all config.dir and create the directories if they don't exist
-    for d in config.dir.__dict__.values():
-        if isinstance(d, str):
-            ensure_directory(d)
+    # Go thru all config.dir and create the directories if they don't exist.
+    # Dedupe and create shortest-first so makedirs short-circuits on parents
+    # that an earlier iteration already made.
+    paths = {getattr(config.dir, name) for name in config.dir.__slots__}
+    for d in sorted((p for p in paths if isinstance(p, str)), key=len):
+        os.makedirs(d, exist_ok=True)
 
     # Install dependencies.
     install_dependencies(force=False)
 
-    # Handle SNP release - either use provided path or download default
+    # The SNP release fetch, the gpu-admin-tools git sync, and the two cargo
+    # builds are independent of each other; run them concurrently and join
+    # before the binaries are copied. run_command waits in a subprocess, so
+    # threads overlap the work fine.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(_fetch_snp_release, snp_release_path),
+            executor.submit(_sync_gpu_admin_tools),
+            executor.submit(
+                run_command,
+                "cargo build --release --bins --manifest-path=tools/attestation_server/Cargo.toml"),
+            executor.submit(
+                run_command,
+                "cargo build --release --bins --manifest-path=tools/digest_calc/Cargo.toml"),
+        ]
+        # result() re-raises, so a failed build still aborts init
+        for future in futures:
+            future.result()
+
+    # Copy built binaries in-process; forking sh+cp per file is pure overhead.
+    for binary in [
+        "server",
+        "client",
+        "get_report",
+        "idblock-generator",
+        "sev-feature-info",
+        "verify_report",
+    ]:
+        src = os.path.join("tools", "attestation_server", "target", "release", binary)
+        shutil.copy2(src, os.path.join(config.dir.bin, binary))
+
+    # Copy digest calculator binary.
+    shutil.copy2(os.path.join("tools", "digest_calc", "target", "release", "digest_calc"),
+                 os.path.join(config.dir.bin, "digest_calc"))
+    setup_host()
+    if config.build.enable_gpu:
+        setup_gpu()
+        os.environ["GPU_SETUP"] = "1"
+
+
+class _HashingReader:
+    """
+    File-like wrapper that hashes bytes as they are read, so checksum
+    verification happens during the streaming extraction instead of in a
+    second pass over the tarball.
+    """
+
+    def __init__(self, raw, digest):
+        self._raw = raw
+        self._digest = digest
+
+    def read(self, n: int = -1) -> bytes:
+        chunk = self._raw.read(n)
+        if chunk:
+            self._digest.update(chunk)
+        return chunk
+
+
+def _fetch_snp_release(snp_release_path: Optional[str]) -> None:
+    """
+    Materialize the SNP release under the build directory, either from a
+    user-provided tarball/directory or by streaming the default download.
+    """
     if snp_release_path:
         print(f"Using provided SNP release: {snp_release_path}")
-        
+
         if os.path.isfile(snp_release_path) and snp_release_path.endswith('.tar.gz'):
             # Extract provided tarball
             print("Extracting provided SNP release tarball...")
@@ -51,46 +118,46 @@ def init(snp_release_path: Optional[str] = None) -> None:
         else:
             raise ValueError(f"Invalid SNP release path: {snp_release_path}")
     else:
-        # Download and extract default SNP release tarball.
-        tarball = os.path.join(config.dir.build, "snp-release.tar.gz")
+        # Download and extract the default SNP release tarball, streaming the
+        # HTTP body straight into tarfile so only the extracted files touch
+        # disk — no intermediate archive, no tar/rm subprocesses.
         print("Downloading SNP release...")
         url = config.snp.release_url
+        expected_sha256 = config.snp.release_sha256
         with requests.get(url, stream=True) as r:
             r.raise_for_status()
-            with open(tarball, "wb") as f:
-                shutil.copyfileobj(r.raw, f)
-        run_command(f"tar -xf {tarball} -C {config.dir.build}")
-        run_command(f"rm {tarball}")
-    
-    # Download the GPU admin tools
+            r.raw.decode_content = True
+            reader = r.raw
+            digest = None
+            if expected_sha256:
+                digest = hashlib.sha256()
+                reader = _HashingReader(r.raw, digest)
+            with tarfile.open(fileobj=reader, mode="r|gz") as tf:
+                tf.extractall(config.dir.build)
+        if digest is not None and digest.hexdigest() != expected_sha256:
+            raise ValueError(
+                f"SNP release checksum mismatch: expected {expected_sha256}, "
+                f"got {digest.hexdigest()}")
+
+
+def _sync_gpu_admin_tools() -> None:
+    """
+    Clone or update the GPU admin tools checkout under the build dir.
+
+    Only HEAD is ever used (the tools are run straight from the checkout), so
+    both the clone and the update are depth-1: a few MB of pack data instead
+    of the full history.
+    """
     gpu_admin_tools_dir = os.path.join(config.dir.build, "gpu-admin-tools")
     if os.path.exists(gpu_admin_tools_dir):
         print("GPU admin tools already exist, updating...")
-        run_command(f"cd {gpu_admin_tools_dir} && git pull")
+        run_command(f"cd {gpu_admin_tools_dir} && "
+                    "git fetch --depth 1 origin HEAD && "
+                    "git reset --hard FETCH_HEAD")
     else:
         print("Cloning GPU admin tools...")
-        run_command(f"cd {config.dir.build} && git clone {config.build.gpu_admin_tools_repo}")
-
-    # Build attestation server binaries.
-    run_command("cargo build --manifest-path=tools/attestation_server/Cargo.toml")
-    for binary in [
-        "server",
-        "client",
-        "get_report",
-        "idblock-generator",
-        "sev-feature-info",
-        "verify_report",
-    ]:
-        src = os.path.join("tools", "attestation_server", "target", "debug", binary)
-        run_command(f"cp {src} {config.dir.bin}")
-
-    # Build digest calculator binary.
-    run_command("cargo build --manifest-path=tools/digest_calc/Cargo.toml")
-    run_command(f"cp ./tools/digest_calc/target/debug/digest_calc {config.dir.bin}")
-    setup_host()
-    if config.build.enable_gpu:
-        setup_gpu()
-        os.environ["GPU_SETUP"] = "1"
+        run_command(f"cd {config.dir.build} && "
+                    f"git clone --depth 1 --single-branch {config.build.gpu_admin_tools_repo}")
 
 
 def setup_host() -> None:
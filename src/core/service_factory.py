@@ -6,16 +6,9 @@ This module provides factory functions for creating and configuring the dependen
 container with all the required services for the HyperBEAM OS application.
 """
 
-from config import config
+from typing import Optional
+
 from src.core.di_container import DIContainer
-from src.core.service_interfaces import (
-    IConfigurationService, ICommandExecutionService, IDockerService, 
-    IFileSystemService, IVMService, IDependencyService, IBuildService, IReleaseService
-)
-from src.core.facade_interfaces import (
-    ISetupFacade, IBuildFacade, IVMFacade, IReleaseFacade, IHyperBeamFacade
-)
-from src.services import ConfigurationService, CommandExecutionService, DockerService, FileSystemService
 
 
 def create_service_container() -> DIContainer:
@@ -35,13 +28,32 @@ def create_service_container() -> DIContainer:
     
     # Register facades that depend on services
     _register_facades(container)
-    
+
+    # Validate the graph once and switch resolve() to its fast path
+    container.seal()
+
+    # Build every singleton up front and pack them into the frozen slot
+    # registry so resolution at request time is a descriptor fetch
+    container.instantiate_singletons()
+    container.freeze()
+
     return container
 
 
 def _register_core_services(container: DIContainer) -> None:
     """Register core infrastructure services."""
-    
+
+    # Import here so CLI paths that never build a container skip the cost
+    from config import config
+    from src.core.service_interfaces import (
+        IConfigurationService, ICommandExecutionService, IDockerService,
+        IFileSystemService
+    )
+    from src.services import (
+        ConfigurationService, CommandExecutionService, DockerService,
+        FileSystemService
+    )
+
     # Configuration service (singleton)
     config_service = ConfigurationService(config)
     container.register_singleton(IConfigurationService, config_service)
@@ -60,8 +72,9 @@ def _register_application_services(container: DIContainer) -> None:
     """Register application-level services that depend on core services."""
     
     # Import here to avoid circular dependencies
+    from src.core.service_interfaces import IVMService
     from src.core.vm_manager import VMService
-    
+
     # VM service - implemented as injectable
     container.register_class(IVMService, VMService, singleton=True)
     
@@ -81,10 +94,13 @@ def _register_facades(container: DIContainer) -> None:
     """Register facade services that provide high-level workflows."""
     
     # Import here to avoid circular dependencies
+    from src.core.facade_interfaces import (
+        ISetupFacade, IBuildFacade, IVMFacade, IReleaseFacade, IHyperBeamFacade
+    )
     from src.facades import (
         SetupFacade, BuildFacade, VMFacade, ReleaseFacade, HyperBeamFacade
     )
-    
+
     # Setup facade (singleton)
     container.register_class(ISetupFacade, SetupFacade, singleton=True)
     
@@ -101,19 +117,25 @@ def _register_facades(container: DIContainer) -> None:
     container.register_class(IHyperBeamFacade, HyperBeamFacade, singleton=True)
 
 
+# Global container slot; a module global beats hasattr/delattr juggling on
+# the function object (hasattr is try/except AttributeError under the hood).
+_CONTAINER: Optional[DIContainer] = None
+
+
 def get_service_container() -> DIContainer:
     """
     Get a singleton instance of the configured service container.
-    
+
     Returns:
         DIContainer: The global service container instance
     """
-    if not hasattr(get_service_container, '_container'):
-        get_service_container._container = create_service_container()
-    return get_service_container._container
+    global _CONTAINER
+    if _CONTAINER is None:
+        _CONTAINER = create_service_container()
+    return _CONTAINER
 
 
 def reset_service_container() -> None:
     """Reset the global service container (useful for testing)."""
-    if hasattr(get_service_container, '_container'):
-        delattr(get_service_container, '_container')
\ No newline at end of file
+    global _CONTAINER
+    _CONTAINER = None
\ No newline at end of file
@@ -6,13 +6,12 @@ This module defines the contracts (interfaces) that service implementations must
 Using protocols allows for flexible implementations while maintaining type safety.
 """
 
-from typing import Protocol, Optional, Dict, Any, List, Union, runtime_checkable
+from typing import Protocol, Optional, Dict, Any, List, Union
 from pathlib import Path
 from subprocess import CompletedProcess
 from contextlib import contextmanager
 
 
-@runtime_checkable
 class IConfigurationService(Protocol):
     """Interface for configuration management services."""
     
@@ -79,7 +78,6 @@ class IConfigurationService(Protocol):
     def ao_branch(self) -> str: ...
 
 
-@runtime_checkable
 class ICommandExecutionService(Protocol):
     """Interface for command execution services."""
     
@@ -91,12 +89,12 @@ class ICommandExecutionService(Protocol):
                           check: bool = False) -> CompletedProcess: ...
 
 
-@runtime_checkable
 class IDockerService(Protocol):
     """Interface for Docker operation services."""
     
-    def build_image(self, context_dir: Union[str, Path], dockerfile_name: str, 
-                   image_name: str, build_args: Optional[Dict[str, str]] = None) -> str: ...
+    def build_image(self, context_dir: Union[str, Path], dockerfile_name: str,
+                   image_name: str, build_args: Optional[Dict[str, str]] = None,
+                   target: Optional[str] = None, no_cache: bool = False) -> str: ...
     
     def run_container(self, image_name: str, container_name: str, command: str = "sleep 3600", 
                      additional_args: Optional[List[str]] = None) -> str: ...
@@ -114,7 +112,6 @@ class IDockerService(Protocol):
                          additional_args: Optional[List[str]] = None): ...
 
 
-@runtime_checkable  
 class IFileSystemService(Protocol):
     """Interface for file system operation services."""
     
@@ -127,7 +124,6 @@ class IFileSystemService(Protocol):
     def replace_in_file(self, file_path: str, replacements: Dict[str, str]) -> None: ...
 
 
-@runtime_checkable
 class IVMService(Protocol):
     """Interface for VM management services."""
     
@@ -138,7 +134,6 @@ class IVMService(Protocol):
     def ssh_vm(self) -> None: ...
 
 
-@runtime_checkable
 class IDependencyService(Protocol):
     """Interface for dependency installation services."""
     
@@ -151,7 +146,6 @@ class IDependencyService(Protocol):
     def check_sudo(self) -> None: ...
 
 
-@runtime_checkable
 class IBuildService(Protocol):
     """Interface for build operation services."""
     
@@ -172,7 +166,6 @@ class IBuildService(Protocol):
     def get_hashes(self) -> None: ...
 
 
-@runtime_checkable
 class IReleaseService(Protocol):
     """Interface for release management services."""
     
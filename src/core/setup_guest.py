@@ -6,6 +6,8 @@ Refactored from global state to class-based approach with proper resource manage
 This module handles NBD device mounting, file copying, and dm-verity hash tree computation.
 """
 
+import glob
+import json
 import os
 import re
 import shutil
@@ -14,7 +16,18 @@ import sys
 import tempfile
 import time
 from contextlib import contextmanager
-from src.utils import run_command, run_command_silent, CommandBuilder, HyperBeamError
+from src.utils import run_command, run_command_silent, HyperBeamError
+
+# Static argv prefixes shared across the fork-heavy setup path. Building them
+# once keeps call sites to a single [*PREFIX, dynamic...] splat and keeps the
+# sudo/chroot and rsync flag sets in one place.
+SUDO = ("sudo",)
+CHROOT = SUDO + ("chroot",)
+# No -S: sparse is rejected alongside --inplace by rsync < 3.2.0 (still the
+# stock rsync on Ubuntu 20.04/RHEL 8), and the freshly mkfs'd ext4 target
+# makes its savings marginal anyway.
+RSYNC = SUDO + ("rsync", "-axHAWX", "--numeric-ids",
+                "--inplace", "--whole-file", "--no-compress")
 
 
 class GuestSetupError(HyperBeamError):
@@ -34,7 +47,7 @@ class GuestSetup:
     """
     
     def __init__(self, src_image, build_dir, out_image, out_hash_tree, out_root_hash,
-                 debug="0", non_interactive=False, device=None):
+                 debug="0", non_interactive=False, device=None, force=False):
         """
         Initialize guest setup configuration.
         
@@ -47,6 +60,8 @@ class GuestSetup:
             debug (str): Debug mode flag ("0" for normal, other for debug)
             non_interactive (bool): If True, don't prompt for user confirmation
             device (str, optional): NBD device to use
+            force (bool): If True, redo the full filesystem copy even when the
+                destination already holds a copy of the current source image
         """
         # Core configuration
         self.src_image = src_image
@@ -57,6 +72,7 @@ class GuestSetup:
         self.debug = debug
         self.non_interactive = non_interactive
         self.fs_device = device
+        self.force = force
         
         # Device and folder configuration
         self.src_device = "/dev/nbd0"
@@ -68,6 +84,8 @@ class GuestSetup:
         self.src_root_fs_device = ""
         self.initial_lvm_devices = 0
         self.resources_initialized = False
+        self._lvm_cache = None  # memoized (stdout, stderr) from lvdisplay
+        self._activated_lvm = False  # did mounting the guest activate an LV?
     
     def __enter__(self):
         """Context manager entry - set up resources."""
@@ -110,98 +128,110 @@ class GuestSetup:
         # Unmount any LVM devices we discovered
         self._unmount_lvm_device()
         
-        # Disconnect NBD devices
-        need_sleep = False
-        if os.path.exists(self.src_device):
-            print(f"Disconnecting {self.src_device}")
-            run_command_silent(["sudo", "qemu-nbd", "--disconnect", self.src_device])
-            need_sleep = True
-        
-        if os.path.exists(self.dst_device):
-            print(f"Disconnecting {self.dst_device}")
-            run_command_silent(["sudo", "qemu-nbd", "--disconnect", self.dst_device])
-            need_sleep = True
-        
-        if need_sleep:
-            time.sleep(2)
+        # Disconnect NBD devices concurrently; both waits are independent
+        disconnects = []
+        for device in (self.src_device, self.dst_device):
+            if os.path.exists(device):
+                print(f"Disconnecting {device}")
+                disconnects.append((device, subprocess.Popen(
+                    ["sudo", "qemu-nbd", "--disconnect", device],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)))
+        for _, proc in disconnects:
+            proc.wait()
+
+        # The kernel tears the device down asynchronously after the
+        # disconnect returns; /sys/block/<nbd>/pid exists while a server is
+        # still attached. Poll it instead of sleeping a flat two seconds —
+        # teardown usually completes in well under 100ms.
+        if disconnects:
+            deadline = time.monotonic() + 2.0
+            pid_files = ["/sys/block/%s/pid" % os.path.basename(device)
+                         for device, _ in disconnects]
+            while time.monotonic() < deadline:
+                if not any(os.path.exists(p) for p in pid_files):
+                    break
+                time.sleep(0.05)
         
         # Remove NBD module
         run_command_silent(["sudo", "modprobe", "-r", "nbd"])
 
     # ===================== LVM Management Methods =====================
     
+    def _lvdisplay(self, refresh=False):
+        """
+        Run lvdisplay once and memoize (stdout, stderr) on the instance.
+
+        Each scan walks the LVM metadata and can take hundreds of ms; callers
+        pass refresh=True only when device state may have changed (e.g. after
+        connecting an image).
+        """
+        if self._lvm_cache is None or refresh:
+            proc = subprocess.run(["sudo", "lvdisplay"],
+                                  stdout=subprocess.PIPE,
+                                  stderr=subprocess.PIPE,
+                                  universal_newlines=True)
+            self._lvm_cache = (proc.stdout, proc.stderr)
+        return self._lvm_cache
+
     def _check_lvm(self):
         """Store the number of LVM devices and warn if any are present on the host."""
-        try:
-            result = subprocess.run(["sudo", "lvdisplay"],
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE,
-                                    universal_newlines=True,
-                                    check=True)
-        except subprocess.CalledProcessError:
-            result = subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")
-        
+        stdout, _ = self._lvdisplay(refresh=True)
+
         # Count the number of lines that contain "LV Path"
-        self.initial_lvm_devices = result.stdout.count("LV Path")
+        self.initial_lvm_devices = stdout.count("LV Path")
         if self.initial_lvm_devices > 0:
             print("Warning: a LVM filesystem is currently in use on your system.")
             print("If your guest VM image uses LVM as well, this script might not work as intended.")
             time.sleep(2)
-    
+
     def _get_lvm_device(self):
         """If the VM image uses LVM, set src_root_fs_device accordingly."""
-        # Run lvdisplay and check for warnings
-        proc = subprocess.run(["sudo", "lvdisplay"],
-                              stdout=subprocess.DEVNULL,
-                              stderr=subprocess.PIPE,
-                              universal_newlines=True)
-        if "WARNING" in proc.stderr:
+        # One refreshed scan serves both the warning check and the device
+        # discovery that used to fork lvdisplay twice.
+        stdout, stderr = self._lvdisplay(refresh=True)
+        if "WARNING" in stderr:
             raise GuestSetupError(
                 "Guest VM LVM filesystem could not be mounted. "
                 "Cannot continue. Try creating a new VM using our guide.\n"
-                f"Log from lvdisplay: {proc.stderr}"
+                f"Log from lvdisplay: {stderr}"
             )
-        
+
         # Get current LVM device count and if increased, take the last one
-        proc2 = subprocess.run(["sudo", "lvdisplay"],
-                               stdout=subprocess.PIPE,
-                               stderr=subprocess.DEVNULL,
-                               universal_newlines=True)
-        count = proc2.stdout.count("LV Path")
+        count = stdout.count("LV Path")
         if count > self.initial_lvm_devices:
-            lines = proc2.stdout.splitlines()
-            lv_lines = [line for line in lines if "LV Path" in line]
+            self._activated_lvm = True
+            lv_lines = [line for line in stdout.splitlines() if "LV Path" in line]
             if lv_lines:
                 # The original awk uses the third token
                 tokens = lv_lines[-1].split()
                 if len(tokens) >= 3:
                     self.src_root_fs_device = tokens[2]
                     print("Found LVM2 filesystem: " + self.src_root_fs_device)
-    
+
     def _unmount_lvm_device(self):
         """Unmount any new LVM devices that were discovered after mounting the image."""
-        proc = subprocess.run(["sudo", "lvdisplay"],
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.DEVNULL,
-                              universal_newlines=True)
-        count = proc.stdout.count("LV Path")
+        # Nothing to deactivate unless mounting the guest activated an LV;
+        # skipping here keeps the LVM scan out of every non-LVM teardown.
+        if not self._activated_lvm:
+            return
+        # Reuse the snapshot taken by _get_lvm_device; teardown doesn't need
+        # a fresh scan.
+        stdout, _ = self._lvdisplay()
+        count = stdout.count("LV Path")
         if count > self.initial_lvm_devices:
             print("Unmounting LVM device")
-            lines = proc.stdout.splitlines()
-            lv_lines = [line for line in lines if "LV Path" in line]
-            if lv_lines:
-                tokens = lv_lines[-1].split()
-                if len(tokens) >= 3:
-                    lvm_path = tokens[2]
-                else:
-                    lvm_path = ""
-            vg_lines = [line for line in lines if "VG Name" in line]
-            if vg_lines:
-                vg_tokens = vg_lines[-1].split()
-                if len(vg_tokens) >= 3:
-                    vg_name = vg_tokens[2]
-                else:
-                    vg_name = ""
+            lvm_path = ""
+            vg_name = ""
+            # Single pass over the output for both fields
+            for line in stdout.splitlines():
+                if "LV Path" in line:
+                    tokens = line.split()
+                    if len(tokens) >= 3:
+                        lvm_path = tokens[2]
+                elif "VG Name" in line:
+                    tokens = line.split()
+                    if len(tokens) >= 3:
+                        vg_name = tokens[2]
             if lvm_path and vg_name:
                 subprocess.run(["sudo", "lvchange", "-an", lvm_path], check=False)
                 subprocess.run(["sudo", "vgchange", "-an", vg_name], check=False)
@@ -212,39 +242,88 @@ class GuestSetup:
         """Initialize the NBD module and connect both source and destination images."""
         self._check_lvm()
         run_command(["sudo", "modprobe", "nbd", "max_part=8"], shell=False)
-        run_command(["sudo", "qemu-nbd", "--connect=" + self.src_device, self.src_image], shell=False)
-        run_command(["sudo", "qemu-nbd", "--connect=" + self.dst_device, self.dst_image], shell=False)
+        # The two connects are independent and each blocks on kernel NBD
+        # negotiation; run them side by side.
+        p_src = subprocess.Popen(["sudo", "qemu-nbd", "--connect=" + self.src_device, self.src_image])
+        p_dst = subprocess.Popen(["sudo", "qemu-nbd", "--connect=" + self.dst_device, self.dst_image])
+        if p_src.wait() or p_dst.wait():
+            raise GuestSetupError("Failed to connect NBD devices")
     
     def _create_output_image(self):
         """Create a new output image based on the virtual size of the source image."""
+        # Ask for JSON and use the exact byte count instead of re-parsing the
+        # human-readable "virtual size:" line, which rounded to whole
+        # gigabytes and depended on qemu-img's output formatting.
         try:
-            info = subprocess.check_output(["qemu-img", "info", self.src_image],
-                                           universal_newlines=True)
+            info = json.loads(subprocess.check_output(
+                ["qemu-img", "info", "--output=json", self.src_image],
+                universal_newlines=True))
         except subprocess.CalledProcessError:
             raise GuestSetupError("Error getting qemu-img info for source image")
-        
-        size = None
-        for line in info.splitlines():
-            if "virtual size:" in line:
-                # Expecting something like: virtual size: 10G (10737418240 bytes)
-                # The original awk command prints the third token and appends "G"
-                tokens = line.split()
-                if len(tokens) >= 3:
-                    size = tokens[2] + "G"
-                break
-        
-        if size is None:
+
+        size = info.get("virtual-size")
+        if not size:
             raise GuestSetupError("Could not determine image size from qemu-img info")
-        
-        run_command(["qemu-img", "create", "-f", "qcow2", self.dst_image, size], shell=False)
+
+        run_command(["qemu-img", "create", "-f", "qcow2", self.dst_image, str(size)],
+                    shell=False)
     
+    def _dst_is_empty(self):
+        """True if the destination mount holds nothing but lost+found."""
+        with os.scandir(self.dst_folder) as it:
+            return all(entry.name == "lost+found" for entry in it)
+
+    def _copy_marker_path(self):
+        # Beside the output image in the build directory, never inside the
+        # image itself: anything written into the mounted destination would
+        # end up in the dm-verity measured filesystem.
+        return self.dst_image + ".copied.marker"
+
+    def _copy_is_current(self):
+        """
+        True if the output image already holds a full copy of the current
+        source image, judged by the marker written after the last copy.
+        """
+        if not os.path.exists(self.dst_image):
+            return False
+        try:
+            with open(self._copy_marker_path(), "r") as f:
+                marked_mtime = f.read().strip()
+        except OSError:
+            return False
+        return marked_mtime == str(os.path.getmtime(self.src_image))
+
+    def _write_copy_marker(self):
+        """Record the source-image mtime so reruns can skip the full copy."""
+        with open(self._copy_marker_path(), "w") as f:
+            f.write(str(os.path.getmtime(self.src_image)))
+
     def _copy_filesystem(self):
-        """Copy the contents of the source folder to the destination folder using rsync."""
+        """Copy the contents of the source folder to the destination folder."""
+        # Into a freshly-mkfs'd destination, rsync's per-file stat/compare
+        # against the (empty) target tree is pure overhead; a tar pipe does
+        # one sequential read and one sequential write. rsync remains the
+        # fallback for a populated destination or via HB_COPY_RSYNC=1.
+        if self._dst_is_empty() and not os.environ.get("HB_COPY_RSYNC"):
+            tar_flags = ["--numeric-owner", "--xattrs", "--acls", "--selinux"]
+            p_pack = subprocess.Popen(
+                [*SUDO, "tar", *tar_flags, "--one-file-system",
+                 "-cf", "-", "-C", self.src_folder, "."],
+                stdout=subprocess.PIPE)
+            p_unpack = subprocess.Popen(
+                [*SUDO, "tar", *tar_flags, "-xf", "-", "-C", self.dst_folder],
+                stdin=p_pack.stdout)
+            p_pack.stdout.close()
+            if p_unpack.wait() or p_pack.wait():
+                raise GuestSetupError("Failed to copy filesystem: tar pipe failed")
+            return
         try:
-            subprocess.run([
-                "sudo", "rsync", "-axHAWXS", "--numeric-ids", "--info=progress2",
-                self.src_folder + "/", self.dst_folder + "/"
-            ], check=True)
+            # Fresh empty ext4 destination: --inplace/--whole-file skip rsync's
+            # temp-file + rename dance and the rolling checksum, and dropping
+            # --info=progress2 avoids per-file terminal formatting on the
+            # wall-clock-dominant step of setup().
+            subprocess.run([*RSYNC, self.src_folder + "/", self.dst_folder + "/"],
+                           check=True)
         except subprocess.CalledProcessError as e:
             raise GuestSetupError(f"Failed to copy filesystem: {e}")
     
@@ -263,12 +342,13 @@ class GuestSetup:
         except subprocess.CalledProcessError:
             raise GuestSetupError("Error running fdisk on source device")
         
-        # Use regex search (case-insensitive) for a line with "Linux filesystem"
-        match = re.search(r"(/dev/\S+).*Linux filesystem", fdisk_output, re.IGNORECASE)
-        if match:
-            self.src_root_fs_device = match.group(1)
-        else:
-            self.src_root_fs_device = ""
+        # Linear scan for a "Linux filesystem" line; the first token of an
+        # fdisk partition row is always the device path, so no regex needed.
+        self.src_root_fs_device = ""
+        for line in fdisk_output.splitlines():
+            if "linux filesystem" in line.lower() and line.lstrip().startswith("/dev/"):
+                self.src_root_fs_device = line.split(None, 1)[0]
+                break
         
         if self.non_interactive:
             return
@@ -294,9 +374,29 @@ class GuestSetup:
     
     def _prepare_verity_fs(self):
         """Prepare the destination filesystem for dm-verity."""
-        # Remove SSH keys (they will be regenerated later)
-        ssh_path = os.path.join(self.dst_folder, "etc", "ssh", "ssh_host_*")
-        subprocess.run("sudo rm -rf " + ssh_path, shell=True)
+        # The finalization below mutates the tree away from a plain source
+        # copy (root->root_ro, etc->etc_ro, rewritten passwd/grub), so the
+        # copy marker must not survive it: a rerun that reused this image
+        # would replay these steps against paths that no longer exist. Drop
+        # the marker first; reuse therefore only covers reruns after a
+        # failure between the copy and this point.
+        try:
+            os.remove(self._copy_marker_path())
+        except OSError:
+            pass
+
+        # Remove SSH keys (they will be regenerated later). Expand the glob in
+        # Python instead of handing an unescaped pattern to a shell.
+        ssh_keys = glob.glob(os.path.join(self.dst_folder, "etc", "ssh", "ssh_host_*"))
+        if ssh_keys:
+            if os.geteuid() == 0:
+                for path in ssh_keys:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+            else:
+                subprocess.run(["sudo", "rm", "-f"] + ssh_keys, check=False)
         
         if self.debug == "0":
             self._configure_secure_mode()
@@ -305,51 +405,100 @@ class GuestSetup:
         
         # Common filesystem preparations
         self._finalize_filesystem_structure()
-    
+
+    def _rewrite_text_file(self, path, transform):
+        """
+        Apply transform to the file's text and write it back atomically.
+
+        Replaces the per-edit `sudo sed -i` forks: one read, one regex pass in
+        Python, and an os.replace of a temp file in the same directory so the
+        target is never observed half-written. Requires root for files inside
+        the mounted image; falls back to nothing if the file is missing.
+        """
+        try:
+            with open(path, "r") as f:
+                text = f.read()
+        except OSError as e:
+            raise GuestSetupError(f"Failed to read {path}: {e}")
+        new_text = transform(text)
+        if new_text == text:
+            return
+        st = os.stat(path)
+        tmp_path = path + ".tmp"
+        if os.geteuid() == 0:
+            with open(tmp_path, "w") as f:
+                f.write(new_text)
+            os.chmod(tmp_path, st.st_mode)
+            os.chown(tmp_path, st.st_uid, st.st_gid)
+            os.replace(tmp_path, path)
+        else:
+            # Not root: route the write and rename through sudo, keeping the
+            # content off the command line.
+            subprocess.run(["sudo", "tee", tmp_path], input=new_text,
+                           universal_newlines=True, check=True,
+                           stdout=subprocess.DEVNULL)
+            subprocess.run(["sudo", "chmod", oct(st.st_mode & 0o7777)[2:], tmp_path],
+                           check=True)
+            subprocess.run(["sudo", "mv", tmp_path, path], check=True)
+
     def _configure_secure_mode(self):
         """Configure filesystem for secure (black box) mode."""
         print("Configuring secure mode - disabling access interfaces...")
         
-        # Disable SSH service
-        print("Disabling SSH service...")
-        subprocess.run(["sudo", "chroot", self.dst_folder, "systemctl", "disable", "ssh.service"], check=True)
-        subprocess.run(["sudo", "chroot", self.dst_folder, "systemctl", "mask", "ssh.service"], check=True)
-        
+        # Disable ssh, the six tty gettys, and the serial console in a single
+        # chroot invocation; sixteen separate chroots spent most of their
+        # time on process setup.
+        print("Disabling SSH, TTY, and serial console services...")
+        systemctl_cmds = ["systemctl disable ssh.service",
+                          "systemctl mask ssh.service"]
+        for i in range(1, 7):
+            systemctl_cmds.append(f"systemctl disable getty@tty{i}.service")
+            systemctl_cmds.append(f"systemctl mask getty@tty{i}.service")
+        systemctl_cmds.append("systemctl disable serial-getty@ttyS0.service")
+        systemctl_cmds.append("systemctl mask serial-getty@ttyS0.service")
+        subprocess.run([*CHROOT, self.dst_folder, "/bin/sh", "-c",
+                        " && ".join(systemctl_cmds)], check=True)
+
         # Disable login for all users except root by editing /etc/passwd
         passwd_file = os.path.join(self.dst_folder, "etc", "passwd")
-        sed_cmd = ("sudo sed -i '/^[^:]*:[^:]*:[^:]*:[^:]*:[^:]*:[^:]*:\\/bin\\/bash$/ s/\\/bin\\/bash/\\/usr\\/sbin\\/nologin/' " + passwd_file)
-        subprocess.run(sed_cmd, shell=True, check=True)
-        
-        # Disable all TTY services (tty1 through tty6)
-        print("Disabling all TTY services...")
-        for i in range(1, 7):
-            subprocess.run(["sudo", "chroot", self.dst_folder, "systemctl", "disable", f"getty@tty{i}.service"], check=True)
-            subprocess.run(["sudo", "chroot", self.dst_folder, "systemctl", "mask", f"getty@tty{i}.service"], check=True)
-        
-        # Disable serial console (ttyS0)
-        print("Disabling serial console (ttyS0)...")
-        subprocess.run(["sudo", "chroot", self.dst_folder, "systemctl", "disable", "serial-getty@ttyS0.service"], check=True)
-        subprocess.run(["sudo", "chroot", self.dst_folder, "systemctl", "mask", "serial-getty@ttyS0.service"], check=True)
-        
+        self._rewrite_text_file(passwd_file, lambda text: re.sub(
+            r"(?m)^([^:]*(?::[^:]*){5}):/bin/bash$",
+            r"\1:/usr/sbin/nologin", text))
+
         # Remove TTY kernel console configuration from GRUB if the file exists
         grub_path = os.path.join(self.dst_folder, "etc", "default", "grub")
         if os.path.isfile(grub_path):
             print("Removing TTY kernel console configuration from GRUB...")
-            subprocess.run("sudo sed -i 's/console=.*//g' " + grub_path, shell=True, check=True)
-            subprocess.run("sudo sed -i 's/^GRUB_CMDLINE_LINUX_DEFAULT=\"\\(.*\\)\"/GRUB_CMDLINE_LINUX_DEFAULT=\"\\1 console=none\"/' " + grub_path,
-                           shell=True, check=True)
+
+            def strip_console(text):
+                # Stop at quotes so a console= argument inside
+                # GRUB_CMDLINE_LINUX_DEFAULT="..." doesn't take the closing
+                # quote with it (the sed this replaces got that wrong).
+                text = re.sub(r'console=[^\s"]*', "", text)
+                return re.sub(
+                    r'(?m)^GRUB_CMDLINE_LINUX_DEFAULT="(.*)"',
+                    r'GRUB_CMDLINE_LINUX_DEFAULT="\1 console=none"', text)
+
+            self._rewrite_text_file(grub_path, strip_console)
         
         # Ensure no TTY devices are active at runtime
         print("Disabling TTY devices...")
+        running_as_root = os.geteuid() == 0
         for dev in ["tty", "tty0", "tty1", "tty2", "tty3", "tty4", "tty5", "tty6", "ttyS0"]:
             dev_path = os.path.join(self.dst_folder, "dev", dev)
             if os.path.exists(dev_path):
                 new_path = os.path.join(self.dst_folder, "dev", f"{dev}_disabled")
-                subprocess.run(["sudo", "mv", dev_path, new_path], check=False)
+                if running_as_root:
+                    try:
+                        os.rename(dev_path, new_path)
+                    except OSError:
+                        pass
+                else:
+                    subprocess.run(["sudo", "mv", dev_path, new_path], check=False)
         
         # Disable kernel messages to console (dmesg --console-off might fail; ignore error)
         print("Disabling kernel messages to console...")
-        subprocess.run(["sudo", "chroot", self.dst_folder, "dmesg", "--console-off"], check=False)
+        subprocess.run([*CHROOT, self.dst_folder, "dmesg", "--console-off"], check=False)
         print("Black box preparation complete. No TTY or console interfaces are accessible.")
     
     def _configure_debug_mode(self):
@@ -358,7 +507,10 @@ class GuestSetup:
         
         # Set root password in the chroot environment
         print("Setting root password...")
-        subprocess.run(["sudo", "chroot", self.dst_folder, "sh", "-c", "echo 'root:hb' | chpasswd"], check=True)
+        # chpasswd reads credentials from stdin; feed them directly instead of
+        # spawning a shell just to echo into a pipe.
+        subprocess.run([*CHROOT, self.dst_folder, "chpasswd"],
+                       input=b"root:hb\n", check=True)
         
         # Update sshd_config to allow root login and password authentication
         sshd_config_path = os.path.join(self.dst_folder, "etc", "ssh", "sshd_config")
@@ -372,32 +524,45 @@ class GuestSetup:
         
         # Enable and start SSH service in the chroot environment
         print("Enabling SSH service...")
-        subprocess.run(["sudo", "chroot", self.dst_folder, "systemctl", "enable", "ssh.service"], check=True)
+        subprocess.run([*CHROOT, self.dst_folder, "systemctl", "enable", "ssh.service"], check=True)
         
         print("Debug mode configuration complete.")
     
     def _finalize_filesystem_structure(self):
         """Finalize the filesystem structure for dm-verity."""
+        dst = self.dst_folder
+        if os.geteuid() == 0:
+            # Already privileged: straight syscalls instead of ~6 sudo forks
+            shutil.rmtree(os.path.join(dst, "tmp"), ignore_errors=True)
+            os.rename(os.path.join(dst, "root"), os.path.join(dst, "root_ro"))
+            os.rename(os.path.join(dst, "etc"), os.path.join(dst, "etc_ro"))
+            os.rename(os.path.join(dst, "var"), os.path.join(dst, "var_ro"))
+            for name in ("home", "etc", "var", "tmp"):
+                os.makedirs(os.path.join(dst, name), exist_ok=True)
+            shutil.copytree(os.path.join(dst, "root_ro"),
+                            os.path.join(dst, "root"), symlinks=True)
+            return
+
         # Remove any data in tmp folder
-        subprocess.run(["sudo", "rm", "-rf", os.path.join(self.dst_folder, "tmp")], check=True)
-        
+        subprocess.run(["sudo", "rm", "-rf", os.path.join(dst, "tmp")], check=True)
+
         # Rename directories: root, etc, and var
-        subprocess.run(["sudo", "mv", os.path.join(self.dst_folder, "root"), os.path.join(self.dst_folder, "root_ro")], check=True)
-        subprocess.run(["sudo", "mv", os.path.join(self.dst_folder, "etc"), os.path.join(self.dst_folder, "etc_ro")], check=True)
-        subprocess.run(["sudo", "mv", os.path.join(self.dst_folder, "var"), os.path.join(self.dst_folder, "var_ro")], check=True)
-        
+        subprocess.run(["sudo", "mv", os.path.join(dst, "root"), os.path.join(dst, "root_ro")], check=True)
+        subprocess.run(["sudo", "mv", os.path.join(dst, "etc"), os.path.join(dst, "etc_ro")], check=True)
+        subprocess.run(["sudo", "mv", os.path.join(dst, "var"), os.path.join(dst, "var_ro")], check=True)
+
         # Create new directories (home, etc, var, tmp)
         subprocess.run(["sudo", "mkdir", "-p",
-                        os.path.join(self.dst_folder, "home"),
-                        os.path.join(self.dst_folder, "etc"),
-                        os.path.join(self.dst_folder, "var"),
-                        os.path.join(self.dst_folder, "tmp")],
+                        os.path.join(dst, "home"),
+                        os.path.join(dst, "etc"),
+                        os.path.join(dst, "var"),
+                        os.path.join(dst, "tmp")],
                        check=True)
-        
+
         # Copy the contents of the old root folder to the new root directory
         subprocess.run(["sudo", "cp", "-r",
-                        os.path.join(self.dst_folder, "root_ro"),
-                        os.path.join(self.dst_folder, "root")],
+                        os.path.join(dst, "root_ro"),
+                        os.path.join(dst, "root")],
                        check=True)
 
     # ===================== Public Interface =====================
@@ -422,26 +587,48 @@ class GuestSetup:
             GuestSetupError: If any step of the setup process fails
         """
         try:
-            print("Creating output image...")
-            self._create_output_image()
-            
+            # A rerun against an output image that already carries a copy of
+            # this exact source image can keep the image and its filesystem
+            # and skip straight to the HyperBEAM content; the marker beside
+            # the image pins the decision to the source mtime. Recreating the
+            # qcow2 or re-running mkfs would wipe the copy, so both are gated
+            # on the same check.
+            reuse_copy = not self.force and self._copy_is_current()
+
+            if reuse_copy:
+                print("Output image already populated from this source image; "
+                      "skipping image creation and full copy.")
+            else:
+                print("Creating output image...")
+                self._create_output_image()
+
             print("Initializing NBD module...")
             self._initialize_nbd()
-            
+
             print("Finding root filesystem...")
             self._find_root_fs_device()
             print(f"Rootfs device selected: {self.src_root_fs_device}")
-            
-            print("Creating ext4 partition on output image...")
-            subprocess.run(["sudo", "mkfs.ext4", self.dst_device], check=True)
-            
+
+            # mkfs on the output device only gates the destination mount, so
+            # start it and mount the source image while it runs. -F skips the
+            # "not a block special device" prompt on NBD, -q the progress
+            # output neither path reads.
+            p_mkfs = None
+            if not reuse_copy:
+                print("Creating ext4 partition on output image...")
+                p_mkfs = subprocess.Popen(["sudo", "mkfs.ext4", "-F", "-q", self.dst_device])
+
             print("Mounting images...")
             subprocess.run(["sudo", "mount", self.src_root_fs_device, self.src_folder], check=True)
+            if p_mkfs is not None and p_mkfs.wait():
+                raise GuestSetupError("Failed to create ext4 filesystem on output image")
             subprocess.run(["sudo", "mount", self.dst_device, self.dst_folder], check=True)
-            
-            print("Copying files (this may take some time)...")
-            self._copy_filesystem()
-            
+
+            if not reuse_copy:
+                print("Copying files (this may take some time)...")
+                self._copy_filesystem()
+                self._write_copy_marker()
+
             print("Copying HyperBEAM...")
             self._copy_hyperbeam_components()
             
@@ -449,8 +636,10 @@ class GuestSetup:
             self._prepare_verity_fs()
             
             print("Unmounting images...")
-            subprocess.run(["sudo", "umount", "-q", self.src_folder], check=True)
-            subprocess.run(["sudo", "umount", "-q", self.dst_folder], check=True)
+            p_src = subprocess.Popen(["sudo", "umount", "-q", self.src_folder])
+            p_dst = subprocess.Popen(["sudo", "umount", "-q", self.dst_folder])
+            if p_src.wait() or p_dst.wait():
+                raise GuestSetupError("Failed to unmount images")
             
             print("Computing hash tree...")
             root_hash_value = self._compute_hash_tree()
@@ -471,38 +660,40 @@ class GuestSetup:
             print("Copying HyperBEAM components...")
             hb_src = os.path.join(self.build_dir, "content", "hb")
             hb_dst = os.path.join(self.dst_folder, "root")
-            subprocess.run(["sudo", "rsync", "-axHAWXS", "--numeric-ids", "--info=progress2",
-                            hb_src, hb_dst], check=True)
+            subprocess.run([*RSYNC, hb_src, hb_dst], check=True)
             
             print("Copying HyperBEAM service...")
             hb_service_src = os.path.join(self.build_dir, "content", "hyperbeam.service")
             hb_service_dst = os.path.join(self.dst_folder, "etc", "systemd", "system", "hyperbeam.service")
-            subprocess.run(["sudo", "rsync", "-axHAWXS", "--numeric-ids", "--info=progress2",
-                            hb_service_src, hb_service_dst], check=True)
+            subprocess.run([*RSYNC, hb_service_src, hb_service_dst], check=True)
             
             print("Enabling HyperBEAM service...")
-            subprocess.run(["sudo", "chroot", self.dst_folder, "systemctl", "enable", "hyperbeam.service"], check=True)
+            subprocess.run([*CHROOT, self.dst_folder, "systemctl", "enable", "hyperbeam.service"], check=True)
         else:
             print("🐛 Debug mode enabled. Skipping HyperBEAM components and service copy.")
     
     def _compute_hash_tree(self):
         """Compute the dm-verity hash tree and return the root hash."""
-        cmd = (CommandBuilder("sudo", "veritysetup", "format", self.dst_device, self.hash_tree)
-               .pipe("grep", "Root")
-               .pipe("cut", "-f2")
-               .build())
-        
         try:
-            root_hash_value = subprocess.check_output(cmd, shell=True, universal_newlines=True)
+            proc = subprocess.run(
+                ["sudo", "veritysetup", "format", self.dst_device, self.hash_tree],
+                check=True, capture_output=True, universal_newlines=True)
         except subprocess.CalledProcessError as e:
             raise GuestSetupError(f"Error computing hash tree: {e}")
-        
-        # Remove extra whitespace and any trailing '%' characters
-        root_hash_value = root_hash_value.strip().rstrip('%')
-        
+
+        # Parse the "Root hash:" line directly instead of piping veritysetup
+        # through grep and cut in a shell.
+        root_hash_value = ""
+        for line in proc.stdout.splitlines():
+            if line.startswith("Root hash"):
+                root_hash_value = line.split(":", 1)[1].strip()
+                break
+        if not root_hash_value:
+            raise GuestSetupError("Could not find root hash in veritysetup output")
+
         with open(self.root_hash, "w") as f:
             f.write(root_hash_value)
-        
+
         return root_hash_value
 
 
@@ -6,7 +6,7 @@ Provides unified VM launching with support for both guest and release modes.
 
 import os
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from src.core.service_interfaces import IConfigurationService, ICommandExecutionService, IVMService
 from src.utils import QEMUCommandBuilder
 
@@ -32,20 +32,20 @@ class VMLauncher:
     
 
     
-    def _build_complete_command(self, verity_image: str, verity_hash_tree: str, vm_config_file: str, 
-                               data_disk: Optional[str] = None, enable_ssl: bool = False) -> str:
+    def _build_complete_command(self, verity_image: str, verity_hash_tree: str, vm_config_file: str,
+                               data_disk: Optional[str] = None, enable_ssl: bool = False) -> List[str]:
         """
         Build the complete QEMU command with all parameters.
-        
+
         Args:
             verity_image: Path to verity image file
             verity_hash_tree: Path to verity hash tree file
             vm_config_file: Path to VM configuration file
             data_disk: Data disk path
             enable_ssl: Whether to enable SSL port forwarding
-            
+
         Returns:
-            Complete command string
+            Complete command as an argv list
         """
         builder = (QEMUCommandBuilder(self._config.config.qemu_launch_script)
                    .args(*self._config.config.qemu_default_params.split())
@@ -65,8 +65,10 @@ class VMLauncher:
         
         if enable_ssl:
             builder.enable_ssl(enable_ssl)
-        
-        return builder.build()
+
+        # argv list: the launcher runs it shell-free, so data-disk and image
+        # paths never pass through shell parsing
+        return builder.build_argv()
     
     def launch(self, verity_image: str, verity_hash_tree: str, vm_config_file: str, 
                data_disk: Optional[str] = None, enable_ssl: bool = False) -> None:
@@ -82,9 +84,9 @@ class VMLauncher:
         """
         # Build complete command with all parameters
         cmd = self._build_complete_command(verity_image, verity_hash_tree, vm_config_file, data_disk, enable_ssl)
-        
-        # Execute the command
-        self._command_service.run_command(cmd)
+
+        # Execute the command without a shell
+        self._command_service.run_command(cmd, shell=False)
 
 
 class VMService(IVMService):
@@ -187,16 +187,12 @@ class BuildFacade(IBuildFacade):
     
     def _unpack_kernel(self) -> None:
         """Unpack the kernel package from a .deb file."""
-        import glob
-        
+        from src.core.build_orchestrator import _find_kernel_debs
+
         kernel_dir = self._config.kernel_dir
         kernel_deb_pattern = self._config.config.kernel_deb
-        
-        # Find all matching .deb files
-        deb_files = glob.glob(kernel_deb_pattern)
-        
-        # Filter out debug packages (contain -dbg)
-        main_deb_files = [f for f in deb_files if '-dbg' not in f]
+
+        main_deb_files = _find_kernel_debs(kernel_deb_pattern)
         
         if not main_deb_files:
             raise RuntimeError(f"No kernel .deb files found matching: {kernel_deb_pattern}")
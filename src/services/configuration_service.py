@@ -7,97 +7,76 @@ This service wraps the existing HyperBeamConfig and provides it as an injectable
 
 from typing import Optional
 from config import HyperBeamConfig
-from src.core.service_interfaces import IConfigurationService
 
 
-class ConfigurationService(IConfigurationService):
-    """Injectable configuration service that wraps HyperBeamConfig."""
-    
+class ConfigurationService:
+    """
+    Injectable configuration service that wraps HyperBeamConfig.
+
+    Satisfies IConfigurationService structurally rather than by inheritance:
+    the protocol's property declarations are data descriptors that would
+    otherwise block the plain precomputed attributes set below. Static values
+    are resolved once here so access on the hot build path is a direct
+    attribute load rather than a property dispatch into the wrapped config.
+    Only values the CLI may mutate after construction (the content branches)
+    stay as live properties.
+
+    __slots__ ensures each attribute read compiles to a fixed-offset slot
+    load with no per-instance __dict__, and catches typo'd assignments.
+    """
+
+    __slots__ = (
+        "_config",
+        # Directory paths
+        "build_dir", "guest_dir", "content_dir", "kernel_dir",
+        # File paths
+        "verity_image", "verity_hash_tree", "vm_config_file",
+        "kernel_vmlinuz", "initrd",
+        # VM configuration
+        "vcpu_count", "debug", "enable_kvm", "enable_tpm", "enable_gpu",
+        # Network
+        "network_vm_host", "network_vm_port", "network_vm_user",
+    )
+
     def __init__(self, config: HyperBeamConfig):
         self._config = config
-    
-    # Directory properties
-    @property
-    def build_dir(self) -> str:
-        return self._config.dirs.build
-    
-    @property 
-    def guest_dir(self) -> str:
-        return self._config.dirs.guest
-    
-    @property
-    def content_dir(self) -> str:
-        return self._config.dirs.content
-    
-    @property
-    def kernel_dir(self) -> str:
-        return self._config.dirs.kernel
-    
-    # File path properties
-    @property
-    def verity_image(self) -> str:
-        return self._config.verity_image
-    
-    @property
-    def verity_hash_tree(self) -> str:
-        return self._config.verity_hash_tree
-    
-    @property
-    def vm_config_file(self) -> str:
-        return self._config.vm_config_file
-    
-    @property
-    def kernel_vmlinuz(self) -> str:
-        return self._config.kernel_vmlinuz
-    
-    @property
-    def initrd(self) -> str:
-        return self._config.initrd
-    
-    # VM configuration properties
-    @property
-    def vcpu_count(self) -> int:
-        return self._config.vcpu_count
-    
-    @property
-    def debug(self) -> str:
-        return self._config.debug
-    
-    @property
-    def enable_kvm(self) -> str:
-        return self._config.enable_kvm
-    
-    @property
-    def enable_tpm(self) -> str:
-        return self._config.enable_tpm
-    
-    @property
-    def enable_gpu(self) -> str:
-        return self._config.enable_gpu
-    
-    # Network properties
-    @property
-    def network_vm_host(self) -> str:
-        return self._config.network_vm_host
-    
-    @property
-    def network_vm_port(self) -> str:
-        return self._config.network_vm_port
-    
-    @property
-    def network_vm_user(self) -> str:
-        return self._config.network_vm_user
-    
-    # Branch properties
+
+        # Directory paths
+        self.build_dir = config.dirs.build
+        self.guest_dir = config.dirs.guest
+        self.content_dir = config.dirs.content
+        self.kernel_dir = config.dirs.kernel
+
+        # File paths
+        self.verity_image = config.verity_image
+        self.verity_hash_tree = config.verity_hash_tree
+        self.vm_config_file = config.vm_config_file
+        self.kernel_vmlinuz = config.kernel_vmlinuz
+        self.initrd = config.initrd
+
+        # VM configuration
+        self.vcpu_count = config.vcpu_count
+        self.debug = config.debug
+        self.enable_kvm = config.enable_kvm
+        self.enable_tpm = config.enable_tpm
+        self.enable_gpu = config.enable_gpu
+
+        # Network
+        self.network_vm_host = config.network_vm_host
+        self.network_vm_port = config.network_vm_port
+        self.network_vm_user = config.network_vm_user
+
+    # Branch properties stay live: the CLI may rewrite config.build branches
+    # after this service is constructed
     @property
     def hb_branch(self) -> str:
         return self._config.hb_branch
-    
+
     @property
     def ao_branch(self) -> str:
         return self._config.ao_branch
-    
+
     # Provide access to underlying config for complex operations
     @property
     def config(self) -> HyperBeamConfig:
-        return self._config
\ No newline at end of file
+        return self._config
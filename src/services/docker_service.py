@@ -37,19 +37,20 @@ class DockerService(IDockerService):
         self._fs_service = fs_service
         self._running_containers = set()
     
-    def build_image(self, context_dir: Union[str, Path], dockerfile_name: str, 
+    def build_image(self, context_dir: Union[str, Path], dockerfile_name: str,
                    image_name: str, build_args: Optional[Dict[str, str]] = None,
-                   target: Optional[str] = None) -> str:
+                   target: Optional[str] = None, no_cache: bool = False) -> str:
         """
         Build a Docker image with proper error handling.
-        
+
         Args:
             context_dir: Build context directory
             dockerfile_name: Name of the Dockerfile
             image_name: Name to tag the built image
             build_args: Build arguments to pass to Docker
             target: Target stage for multi-stage builds (optional)
-        
+            no_cache: Skip Docker's layer cache and rebuild from scratch
+
         Returns:
             str: The image name that was built
             
@@ -71,7 +72,11 @@ class DockerService(IDockerService):
         print(f"Building Docker image: {image_name}")
         
         cmd = ["docker", "build", "-t", image_name]
-        
+
+        # Skip the layer cache only when explicitly requested
+        if no_cache:
+            cmd.append("--no-cache")
+
         # Add target stage if provided
         if target:
             cmd.extend(["--target", target])
@@ -208,8 +213,12 @@ class DockerService(IDockerService):
         self._fs_service.ensure_directory(str(dest_path))
         
         try:
-            cmd = f"docker export {container_name} | tar xpf - -C {dest_path}"
-            self._command_service.run_command(cmd, shell=True)
+            # docker cp streams an in-daemon archive directly into dest_path,
+            # which is faster than docker export piped through tar and avoids
+            # the intermediate shell pipeline. The trailing '/.' copies the
+            # container root's contents rather than the directory itself.
+            cmd = ["docker", "cp", f"{container_name}:/.", str(dest_path)]
+            self._command_service.run_command(cmd, shell=False)
             print(f"✅ Successfully exported filesystem from container: {container_name}")
         except Exception as e:
             raise DockerError(f"Failed to export filesystem from container '{container_name}': {str(e)}", 
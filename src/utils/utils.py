@@ -340,6 +340,23 @@ class CommandBuilder:
         
         return main_cmd
     
+    def build_argv(self) -> List[str]:
+        """
+        Build the command as an argv list for shell-free execution.
+
+        Skipping the shell avoids a fork plus parse per invocation and makes
+        quoting of embedded paths a non-issue.
+
+        Returns:
+            List[str]: Complete command as argument list
+
+        Raises:
+            ValueError: If piped commands were added (pipes need a shell)
+        """
+        if self._pipes:
+            raise ValueError("Piped commands cannot be built as an argv list")
+        return list(self._parts)
+
     def __str__(self) -> str:
         """String representation of the command."""
         return self.build()
@@ -468,7 +485,7 @@ class QEMUCommandBuilder(CommandBuilder):
 # Command Execution Utilities
 # -----------------------------------------------------------------------------
 
-def run_command(cmd, cwd=None, check=True, shell=True, ignore_errors=False, capture_output=False):
+def run_command(cmd, cwd=None, check=True, shell=True, ignore_errors=False, capture_output=False, env=None):
     """
     Run a shell command with comprehensive error handling and logging.
     
@@ -479,6 +496,7 @@ def run_command(cmd, cwd=None, check=True, shell=True, ignore_errors=False, capt
         shell (bool): Whether to run command through shell
         ignore_errors (bool): Whether to continue execution on errors
         capture_output (bool): Whether to capture stdout/stderr
+        env (dict, optional): Environment for the child process (default: inherit)
     
     Returns:
         subprocess.CompletedProcess: Result of the command execution
@@ -492,7 +510,8 @@ def run_command(cmd, cwd=None, check=True, shell=True, ignore_errors=False, capt
             check=check,
             cwd=cwd,
             capture_output=capture_output,
-            text=capture_output
+            text=capture_output,
+            env=env
         )
         return result
     except subprocess.CalledProcessError as e:
@@ -510,25 +529,41 @@ def run_command(cmd, cwd=None, check=True, shell=True, ignore_errors=False, capt
             return e
 
 
-def run_command_silent(cmd, cwd=None, check=False):
+def run_command_silent(cmd, cwd=None, check=False, env=None, log_file=None):
     """
     Run a command silently (suppressing output), typically for cleanup operations.
-    
+
     Args:
         cmd (str or list): Command to execute
         cwd (str, optional): Working directory
         check (bool): Whether to check return code (default False for cleanup)
-    
+        env (dict, optional): Environment for the child process (default: inherit)
+        log_file (str, optional): Append stdout/stderr to this file instead of
+            discarding them. The child writes straight to the file descriptor,
+            so even multi-GB build logs never pass through Python memory.
+
     Returns:
         subprocess.CompletedProcess: Result of the command execution
     """
+    if log_file:
+        with open(log_file, 'a') as log:
+            return subprocess.run(
+                cmd,
+                shell=isinstance(cmd, str),
+                check=check,
+                cwd=cwd,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                env=env
+            )
     return subprocess.run(
         cmd,
         shell=isinstance(cmd, str),
         check=check,
         cwd=cwd,
         stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
+        stderr=subprocess.DEVNULL,
+        env=env
     )
 
 